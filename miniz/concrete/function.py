@@ -10,7 +10,7 @@ from miniz.ownership import Owned
 from miniz.concrete.signature import Parameter
 from miniz.core import TypeProtocol
 from miniz.vm.instruction import Instruction
-from utils import NotifyingList
+from utils import IndexedList, NotifyingList
 
 
 class FunctionBody(IFunctionBody):
@@ -66,7 +66,7 @@ class Local(ILocal):
     def index(self):
         if self.owner is None:
             raise ValueError(f"Local {self} doesn't have an owner")
-        return self.owner.locals.index(self)
+        return self.owner.locals.index_of(self)
 
 
 class Function(IFunction, IGeneric):
@@ -78,7 +78,7 @@ class Function(IFunction, IGeneric):
 
     _body: FunctionBody
 
-    _locals: NotifyingList[Local]
+    _locals: IndexedList[Local]
 
     def __init__(self, name: str = None, return_type: TypeProtocol = None):
         Owned.__init__(self)
@@ -87,7 +87,7 @@ class Function(IFunction, IGeneric):
         self.signature.owner = self
         self.generic_signature = None
         self._body = FunctionBody(self)
-        self._locals = NotifyingList()
+        self._locals = IndexedList()
 
         def on_add_local(_, local: Local):
             if local.owner is not None:
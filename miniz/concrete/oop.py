@@ -1,20 +1,24 @@
+import threading
+import weakref
 from dataclasses import dataclass
 from enum import Enum
+from typing import Callable
 
 import miniz.ownership
 from miniz.concrete.function import Function, FunctionBody
 from miniz.concrete.function_signature import FunctionSignature
-from miniz.concrete.overloading import OverloadGroup
+from miniz.concrete.overloading import OverloadGroup, OverloadGroupType
 from miniz.concrete.signature import Parameter
 from miniz.generic import GenericParameter
 from miniz.generic.oop import GenericClassInstance
 from miniz.interfaces.function import IFunction
 from miniz.interfaces.oop import Binding, IOOPMemberDefinition, IField, IMethod, IProperty, IClass, IInterface, ITypeclass, OOPImplementable, IOOPDefinition, IMethodBody, IDefinition, \
-    IOOPMemberReference, IOOPReference
+    IOOPMemberReference, IOOPReference, type_version, dispatch_version
 from miniz.core import TypeProtocol, ObjectProtocol, ScopeProtocol
 from miniz.interfaces.overloading import Argument, OverloadMatchResult
+from miniz.template.unification import Unifier, decompose
 from miniz.vm import instructions as vm
-from utils import NotifyingList
+from utils import IndexedList, NotifyingList, VersionCounter
 from zs.zs2miniz.lib import Scope
 
 
@@ -33,20 +37,61 @@ class MemberDefinition(IOOPMemberDefinition):
 
 class Field(MemberDefinition, IField):
     field_type: TypeProtocol
-    default_value: ObjectProtocol | None
     access: Access
 
+    _binding: Binding
+    _default_value: ObjectProtocol | None
+    _slot: int | None = None
+
     def __init__(self, name: str, type: TypeProtocol = None, default_value: ObjectProtocol = None, binding: Binding = Binding.Instance, access: Access = Access.ReadWrite):
         super().__init__(name, binding)
         self.field_type = type
         self.default_value = default_value
         self.access = access
 
+    @property
+    def binding(self):
+        return self._binding
+
+    @binding.setter
+    def binding(self, value: Binding):
+        self._binding = value
+        self._invalidate_owner()
+
+    @property
+    def default_value(self):
+        return self._default_value
+
+    @default_value.setter
+    def default_value(self, value: ObjectProtocol | None):
+        self._default_value = value
+        self._invalidate_owner()
+
     @property
     def index(self):
         if self.owner is None:
             raise ValueError(f"Field {self} doesn't have an owner")
-        return self.owner.fields.index(self)
+        return self.owner.fields.index_of(self)
+
+    @property
+    def slot(self) -> int:
+        """
+        The index of this field in the data that holds it. That is, an instance of the owner class (or any of its
+        subclasses) for instance fields, the static storage of the owner for static fields and the class storage of
+        the owner (or any of its subclasses) for class fields.
+        """
+        slot = self._slot
+        if slot is None:
+            if self.owner is None:
+                raise ValueError(f"Field {self} doesn't have an owner")
+            self.owner.get_layout(self.binding)
+            slot = self._slot
+        return slot
+
+    def _invalidate_owner(self):
+        owner = getattr(self, "owner", None)
+        if isinstance(owner, Class):
+            owner._invalidate()
 
     def __repr__(self):
         match self.access:
@@ -68,7 +113,7 @@ class MethodBody(FunctionBody, IMethodBody):
 
     @property
     def has_this(self):
-        return self.method.binding == Binding.Instance
+        return self.method.binding in (Binding.Instance, Binding.Virtual)
 
     @property
     def has_cls(self):
@@ -98,6 +143,8 @@ class MethodBody(FunctionBody, IMethodBody):
 
 
 class Method(Function, MemberDefinition, IMethod):
+    _vtable_slot: int | None = None
+
     def __init__(self, name: str = None, return_type: TypeProtocol = None, binding: Binding = Binding.Instance):
         Function.__init__(self, name, return_type)
         MemberDefinition.__init__(self, name, binding)
@@ -105,8 +152,20 @@ class Method(Function, MemberDefinition, IMethod):
 
         self._body = MethodBody(self)
 
-    # def __repr__(self):
-    #     return f"{self.signature} [{self.binding.name}] {{}}"
+    @property
+    def vtable_slot(self) -> int:
+        """
+        The index of this method in the virtual table of the owner class (and all of its subclasses).
+        """
+        slot = self._vtable_slot
+        if slot is None:
+            if self.binding != Binding.Virtual:
+                raise ValueError(f"Method {self} is not virtual")
+            if self.owner is None:
+                raise ValueError(f"Method {self} doesn't have an owner")
+            self.owner.vtable
+            slot = self._vtable_slot
+        return slot
 
 
 class Property(MemberDefinition, IProperty):
@@ -149,6 +208,65 @@ class Property(MemberDefinition, IProperty):
             f" = {self.default_value}" if self.default_value is not None else '') + ';'
 
 
+@dataclass(slots=True)
+class InstanceLayout:
+    """
+    Describes the data of instances of a class, or the storage of its static or class fields. Instance and class
+    fields of a base class occupy the same slots in all of its subclasses, so such a layout always starts with the
+    layout of the base class.
+    """
+
+    size: int
+    slots: dict[IField, int]
+    defaults: list[ObjectProtocol | None]
+    """
+    The initial data of an instance. This list should be copied, not modified.
+    """
+
+
+@dataclass(slots=True)
+class VirtualTable:
+    """
+    The implementations of the virtual methods of a class. A virtual method occupies the same slot in all subclasses
+    of the class which declares it, holding the override of the most derived class.
+    """
+
+    methods: list[IMethod]
+    slots: dict[IMethod, int]
+
+
+class FieldStorage:
+    """
+    Holds the values of the static or class fields of a class.
+    """
+
+    __slots__ = ("layout", "_data")
+
+    layout: InstanceLayout
+    _data: list[ObjectProtocol | None]
+
+    def __init__(self, layout: InstanceLayout):
+        self.layout = layout
+        self._data = layout.defaults.copy()
+
+    @property
+    def data(self):
+        return self._data
+
+    def relayout(self, layout: InstanceLayout):
+        """
+        Moves the values of the fields to the slots given by the new layout. Fields which are not in the new
+        layout are dropped and new fields get their default value.
+        """
+        data = layout.defaults.copy()
+        for field, slot in self.layout.slots.items():
+            new_slot = layout.slots.get(field)
+            if new_slot is not None:
+                data[new_slot] = self._data[slot]
+        self.layout = layout
+        self._data = data
+
+
 class Class(IClass, TypeProtocol, ScopeProtocol):
     as_member: miniz.ownership.Member["Class"]
 
@@ -157,9 +275,9 @@ class Class(IClass, TypeProtocol, ScopeProtocol):
     _scope: Scope
 
     _base: "Class | None"
-    _interfaces: list["Interface"]
+    _interfaces: NotifyingList["Interface"]
 
-    _fields: NotifyingList[IField]
+    _fields: IndexedList[IField]
     _methods: NotifyingList[IMethod]
     _properties: NotifyingList[IProperty]
     _constructor: OverloadGroup[IMethod]
@@ -167,6 +285,22 @@ class Class(IClass, TypeProtocol, ScopeProtocol):
 
     _nested_classes_and_interfaces: NotifyingList["NestedClass | NestedInterface"]
 
+    _layout: InstanceLayout | None
+    _static_layout: InstanceLayout | None
+    _class_layout: InstanceLayout | None
+    _static_storage: FieldStorage | None
+    _class_storage: FieldStorage | None
+    _storage_lock: threading.Lock
+    _vtable: VirtualTable | None
+    _itables: dict[OOPImplementable, dict[IMethod, IMethod] | None]
+    _itables_version: int
+    _derived: "weakref.WeakSet[Class]"
+    _ancestors: tuple["Class", ...]
+    _depth: int
+    _members_version: VersionCounter
+    _member_table: dict[str, IOOPMemberDefinition | None]
+    _member_table_version: int
+
     def __init__(self, name: str | None = None):
         super().__init__()
         self.name = name
@@ -177,9 +311,21 @@ class Class(IClass, TypeProtocol, ScopeProtocol):
         self._scope = Scope()
 
         self._base = None
-        self._interfaces = []
-
-        self._fields = NotifyingList()
+        self._layout = self._static_layout = self._class_layout = None
+        self._static_storage = self._class_storage = None
+        self._storage_lock = threading.Lock()
+        self._vtable = None
+        self._itables = {}
+        self._itables_version = -1
+        self._derived = weakref.WeakSet()
+        self._ancestors = (self,)
+        self._depth = 0
+        self._members_version = VersionCounter()
+        self._member_table = {}
+        self._member_table_version = self._members_version.value
+        self._interfaces = NotifyingList()
+
+        self._fields = IndexedList()
         self._methods = NotifyingList()
         self._properties = NotifyingList()
 
@@ -192,6 +338,8 @@ class Class(IClass, TypeProtocol, ScopeProtocol):
             if member.owner is not None:
                 raise TypeError
 
+            self._invalidate_members()
+
             if isinstance(member, IFunction):
                 if not isinstance(member, IMethod):
                     raise TypeError
@@ -202,14 +350,21 @@ class Class(IClass, TypeProtocol, ScopeProtocol):
                         self._scope.create_name(group.name, group)
                     group.overloads.append(member)
                 member.owner = self
+                if ms is self.methods:
+                    self._invalidate()
+                elif ms is self.constructors:
+                    type_version.bump()
                 return
             if member.name:
                 self._scope.create_name(member.name, member)
             member.owner = self
+            if ms is self.fields:
+                self._invalidate()
 
         def on_remove_member(ms, member: int | MemberDefinition):
             if isinstance(member, int):
                 member = ms[member]
+            self._invalidate_members()
             if member.name:
                 if ms is self.methods:
                     if ms is self.methods:
@@ -218,6 +373,13 @@ class Class(IClass, TypeProtocol, ScopeProtocol):
                         group.overloads.remove(member)
                 self._scope.delete_name(member.name)
             member.owner = None
+            if ms is self.fields or ms is self.methods:
+                self._invalidate()
+            elif ms is self.constructors:
+                type_version.bump()
+
+        def on_interfaces_changed(*_):
+            type_version.bump()
 
         self._fields.append += on_add_member
         self._methods.append += on_add_member
@@ -240,13 +402,130 @@ class Class(IClass, TypeProtocol, ScopeProtocol):
 
         self._nested_classes_and_interfaces.remove += on_remove_member
 
+        self._interfaces.append += on_interfaces_changed
+        self._interfaces.extend += on_interfaces_changed
+        self._interfaces.pop += on_interfaces_changed
+        self._interfaces.remove += on_interfaces_changed
+        self._interfaces.__setitem__ += on_interfaces_changed
+        self._interfaces.__delitem__ += on_interfaces_changed
+
     @property
     def base(self):
         return self._base
 
     @base.setter
     def base(self, value: "Class | None"):
+        if value is not None and value.is_subclass_of(self):
+            raise ValueError(f"Can't set the base of {self} to {value} because it would create an inheritance cycle")
+        if self._base is not None:
+            self._base._derived.discard(self)
         self._base = value
+        if value is not None:
+            value._derived.add(self)
+        self._update_ancestors()
+        self._invalidate()
+        self._invalidate_members()
+        type_version.bump()
+
+    @property
+    def members_version(self) -> int:
+        """
+        Incremented whenever the names visible through `get_name` may change. That is, when a member is added to or
+        removed from this class or any of its base classes, or when the base of any of them changes.
+        """
+        return self._members_version.value
+
+    @property
+    def depth(self) -> int:
+        """
+        The number of base classes of this class.
+        """
+        return self._depth
+
+    @property
+    def ancestors(self) -> tuple["Class", ...]:
+        """
+        This class and all of its base classes, starting from the root of the hierarchy. That is, the class at index
+        `i` has a depth of `i`.
+        """
+        return self._ancestors
+
+    @property
+    def layout(self) -> InstanceLayout:
+        if self._layout is None:
+            self._layout = self._build_layout(Binding.Instance)
+        return self._layout
+
+    @property
+    def static_layout(self) -> InstanceLayout:
+        if self._static_layout is None:
+            self._static_layout = self._build_layout(Binding.Static)
+        return self._static_layout
+
+    @property
+    def class_layout(self) -> InstanceLayout:
+        if self._class_layout is None:
+            self._class_layout = self._build_layout(Binding.Class)
+        return self._class_layout
+
+    @property
+    def static_storage(self) -> FieldStorage:
+        """
+        The storage of the static fields declared in this class. It is created on first access.
+        """
+        storage = self._static_storage
+        if storage is None or storage.layout is not self._static_layout:
+            storage = self._update_storage(Binding.Static)
+        return storage
+
+    @property
+    def class_storage(self) -> FieldStorage:
+        """
+        The storage of the class fields of this class, including those declared in base classes. It is created on first access.
+        """
+        storage = self._class_storage
+        if storage is None or storage.layout is not self._class_layout:
+            storage = self._update_storage(Binding.Class)
+        return storage
+
+    @property
+    def vtable(self) -> VirtualTable:
+        if self._vtable is None:
+            self._vtable = self._build_vtable()
+        return self._vtable
+
+    def get_itable(self, specification: OOPImplementable) -> dict[IMethod, IMethod] | None:
+        """
+        :return: The interface table of the implementation of the given specification by this class or its nearest
+        base class which implements it, or `None` if the specification is not implemented.
+        """
+        if self._itables_version != dispatch_version.value:
+            self._itables.clear()
+            self._itables_version = dispatch_version.value
+        try:
+            return self._itables[specification]
+        except KeyError:
+            pass
+
+        base = self
+        info = None
+        while info is None and base is not None:
+            info = specification.get_implementation(base)
+            base = base.base
+
+        result = self._itables[specification] = specification.update_itable(info) if info is not None else None
+        return result
+
+    def get_layout(self, binding: Binding) -> InstanceLayout:
+        match binding:
+            case Binding.Instance:
+                return self.layout
+            case Binding.Static:
+                return self.static_layout
+            case Binding.Class:
+                return self.class_layout
+            case _:
+                raise ValueError(f"Fields with binding {binding} don't have a layout")
 
     @property
     def interfaces(self):
@@ -290,36 +569,123 @@ class Class(IClass, TypeProtocol, ScopeProtocol):
             while base is not None:
                 if base.assignable_from(source):
                     return True
+                base = base.base
             return False
 
     def assignable_to(self, target: "TypeProtocol") -> bool:
         if isinstance(target, Class):
             return self.is_subclass_of(target)
-        if isinstance(target, OOPImplementable):
-            base = self
-            while base is not None:
-                if target.is_implemented(self):
-                    return True
-                base = base.base
+        if isinstance(target, OOPImplementable) and self.get_itable(target) is not None:
+            return True
         return target.assignable_from(self)
 
     def is_subclass_of(self, other: "Class"):
-        base = self
-        while base is not None:
-            if other == base:
-                return True
-            base = base.base
-        return False
+        if not isinstance(other, Class):
+            return False
+        depth = other._depth
+        return depth <= self._depth and self._ancestors[depth] is other
 
     def is_base_class_of(self, other: "Class"):
         return other.is_subclass_of(self)
 
+    def _update_ancestors(self):
+        self._ancestors = (self._base._ancestors if self._base is not None else ()) + (self,)
+        self._depth = len(self._ancestors) - 1
+        for derived in self._derived:
+            derived._update_ancestors()
+
+    def _build_layout(self, binding: Binding) -> InstanceLayout:
+        if self._base is not None and binding != Binding.Static:
+            base = self._base.get_layout(binding)
+            slots, defaults = base.slots.copy(), base.defaults.copy()
+        else:
+            slots, defaults = {}, []
+
+        for field in self._fields:
+            if field.binding == binding:
+                field._slot = slots[field] = len(defaults)
+                defaults.append(field.default_value)
+
+        return InstanceLayout(len(defaults), slots, defaults)
+
+    def _build_vtable(self) -> VirtualTable:
+        if self._base is not None:
+            base = self._base.vtable
+            methods, slots = base.methods.copy(), base.slots.copy()
+        else:
+            methods, slots = [], {}
+
+        by_name: dict[str, list[int]] = {}
+        for slot, method in enumerate(methods):
+            by_name.setdefault(method.name, []).append(slot)
+
+        for method in self._methods:
+            if method.binding != Binding.Virtual:
+                continue
+            for slot in by_name.get(method.name, ()):
+                if method.overrides(methods[slot]):
+                    methods[slot] = method
+                    break
+            else:
+                slot = len(methods)
+                methods.append(method)
+            method._vtable_slot = slots[method] = slot
+
+        return VirtualTable(methods, slots)
+
+    def _update_storage(self, binding: Binding) -> FieldStorage:
+        with self._storage_lock:
+            layout = self.get_layout(binding)
+            storage = self._static_storage if binding == Binding.Static else self._class_storage
+            if storage is None:
+                storage = FieldStorage(layout)
+                if binding == Binding.Static:
+                    self._static_storage = storage
+                else:
+                    self._class_storage = storage
+            elif storage.layout is not layout:
+                storage.relayout(layout)
+            return storage
+
+    def _invalidate(self):
+        """
+        Clears data cached from the members and the base of this class. Since subclasses include data from
+        their base, their caches are cleared as well.
+
+        Existing field storages are kept and are moved to the new layout on their next access.
+        """
+        self._layout = self._static_layout = self._class_layout = None
+        self._vtable = None
+        dispatch_version.bump()
+        for field in self._fields:
+            field._slot = None
+        for method in self._methods:
+            method._vtable_slot = None
+        for derived in self._derived:
+            derived._invalidate()
+
+    def _invalidate_members(self):
+        """
+        Outdates the member table of this class and of its subclasses, which include the members of this class.
+        """
+        self._members_version.bump()
+        for derived in self._derived:
+            derived._invalidate_members()
+
     def get_name(self, name: str) -> IOOPMemberDefinition:
-        base = self
-        result = None
-        while result is None and base is not None:
-            result = base._scope.lookup_name(name, default=None)
-            base = base.base
+        if self._member_table_version != self._members_version.value:
+            self._member_table.clear()
+            self._member_table_version = self._members_version.value
+        try:
+            return self._member_table[name]
+        except KeyError:
+            pass
+
+        # names which are not found are cached as well
+        result = self._scope.lookup_name(name, default=None)
+        if result is None and self._base is not None:
+            result = self._base.get_name(name)
+        self._member_table[name] = result
         return result
 
     def instantiate_generic(self, args: list[TypeProtocol]):
@@ -349,7 +715,7 @@ class Interface(IInterface):
 
     _bases: list["Interface"]
 
-    _fields: NotifyingList[Field]
+    _fields: IndexedList[Field]
     _methods: NotifyingList[Method]
     _properties: NotifyingList[Property]
     _constructors: NotifyingList[Method]
@@ -369,7 +735,7 @@ class Interface(IInterface):
 
         self._bases = []
 
-        self._fields = NotifyingList()
+        self._fields = IndexedList()
         self._methods = NotifyingList()
         self._properties = NotifyingList()
         self._constructors = NotifyingList()
@@ -465,6 +831,36 @@ class TypeclassImplementation:
         return f"typeclass {self.typeclass.name}({self.type.name if isinstance(self.type, (Class, Interface, Typeclass)) else self.type});"
 
 
+@dataclass(slots=True)
+class TypeclassMatch:
+    implementation: TypeclassImplementation
+    bindings: dict[GenericParameter, TypeProtocol]
+    """
+    The types bound to the generic parameters of the implemented type.
+    """
+
+
+def _match_type(pattern: TypeProtocol, type: TypeProtocol, bindings: dict[GenericParameter, TypeProtocol]) -> bool:
+    """
+    Matches a type against a pattern, binding the generic parameters of the pattern. Generic parameters in `type` are
+    treated as opaque types.
+    """
+    if isinstance(pattern, GenericParameter):
+        try:
+            return bindings[pattern] is type
+        except KeyError:
+            bindings[pattern] = type
+            return True
+    if pattern is type:
+        return True
+
+    head, args = decompose(pattern)
+    type_head, type_args = decompose(type)
+    if head is not type_head or len(args) != len(type_args):
+        return False
+    return all(_match_type(arg, type_arg, bindings) for arg, type_arg in zip(args, type_args))
+
+
 class Typeclass(ITypeclass):
     name: str | None
 
@@ -473,12 +869,14 @@ class Typeclass(ITypeclass):
 
     _bases: list["Typeclass"]
 
-    _fields: NotifyingList[Field]
+    _fields: IndexedList[Field]
     _methods: NotifyingList[Method]
     _properties: NotifyingList[Property]
     _constructors: NotifyingList[Method]
 
     _implementations: dict[TypeProtocol, TypeclassImplementation]
+    _index: dict[object, list[TypeclassImplementation]]
+    _resolved: dict[TypeProtocol, TypeclassMatch | None]
 
     # _constructor: GenericOverload[Method]  todo
 
@@ -489,9 +887,13 @@ class Typeclass(ITypeclass):
         self._members = {}
         self._member_list = []
 
+        self._implementations = {}
+        self._index = {}
+        self._resolved = {}
+
         self._bases = []
 
-        self._fields = NotifyingList()
+        self._fields = IndexedList()
         self._methods = NotifyingList()
         self._properties = NotifyingList()
         self._constructors = NotifyingList()
@@ -539,6 +941,10 @@ class Typeclass(ITypeclass):
     def bases(self):
         return self._bases
 
+    @bases.setter
+    def bases(self, value: list["Typeclass"]):
+        self._bases = value
+
     @property
     def fields(self):
         return self._fields
@@ -559,12 +965,51 @@ class Typeclass(ITypeclass):
         if type in self._implementations:
             type_name = type.name if isinstance(type, (Class, Interface, Typeclass)) else type
             raise TypeError(f"Typeclass {self.name} is already implemented for type {type_name}")
-        self._implementations[type] = TypeclassImplementation(self, type, implementation_class)
+        implementation = self._implementations[type] = TypeclassImplementation(self, type, implementation_class)
+        self._index.setdefault(decompose(type)[0], []).append(implementation)
+        self._resolved.clear()
+        type_version.bump()
 
     def remove_implementation(self, type: TypeProtocol):
         if type not in self._implementations:
             type_name = type.name if isinstance(type, (Class, Interface, Typeclass)) else type
             raise TypeError(f"Type {type_name} does not implement typeclass {self.name}")
+        implementation = self._implementations.pop(type)
+        self._index[decompose(type)[0]].remove(implementation)
+        self._resolved.clear()
+        type_version.bump()
+
+    def resolve(self, type: TypeProtocol) -> TypeclassMatch | None:
+        """
+        Finds the implementation of this typeclass for the given type. Implementations for generic types (e.g. `List<T>`)
+        match any type that can be made from them by substituting their generic parameters.
+
+        Implementations are indexed by the head constructor of their type, so only implementations with the same head
+        and implementations for a bare generic parameter are tried. An implementation for the exact type is preferred,
+        then the first one added.
+
+        :return: The matching implementation with the bindings of its generic parameters, or `None` if the typeclass
+        is not implemented for the given type.
+        """
+        try:
+            return self._resolved[type]
+        except KeyError:
+            pass
+
+        result = None
+        implementation = self._implementations.get(type)
+        if implementation is not None:
+            result = TypeclassMatch(implementation, {})
+        else:
+            head = decompose(type)[0]
+            for candidate in (*self._index.get(head, ()), *self._index.get(None, ())) if head is not None else ():
+                bindings = {}
+                if _match_type(candidate.type, type, bindings):
+                    result = TypeclassMatch(candidate, bindings)
+                    break
+
+        self._resolved[type] = result
+        return result
 
     def __repr__(self):
         declaration = f"typeclass{(' ' + self.name) if self.name else ''} {(f'< ' + ', '.join(base.name for base in self._bases) + ' ') if self.bases else ''}{{"
@@ -577,20 +1022,103 @@ class Typeclass(ITypeclass):
 
 
 class MethodGroup(OverloadGroup[IMethod], IDefinition):
+    _member_references: dict[tuple, IOOPMemberReference]
+    _member_references_stamp: tuple[int, ...] | None
+
     def __init__(self, name: str, *, owner: IOOPDefinition = None):
         OverloadGroup.__init__(self, name, None, owner=owner)
 
+        self._member_references = {}
+        self._member_references_stamp = None
+
     def get_reference(self, **kwargs):
         return MethodGroupReference(self, **kwargs)
 
+    def get_member_reference(self, callee: IMethod, owner: IOOPReference, type_mappings: dict[GenericParameter, TypeProtocol]) -> IOOPMemberReference:
+        """
+        :return: A reference to `callee` through `owner` whose signature has the given generic arguments substituted.
+        References are reused until the overloads of the group or the type hierarchy change.
+        """
+        stamp = self._stamp()
+        if stamp != self._member_references_stamp:
+            self._member_references.clear()
+            self._member_references_stamp = stamp
+
+        key = callee, owner, frozenset(type_mappings.items())
+        try:
+            return self._member_references[key]
+        except KeyError:
+            pass
+        except TypeError:
+            key = None
+
+        result = callee.get_reference(owner=owner)
+        result.signature = _substitute_signature(callee, Unifier.from_mapping(type_mappings).resolve)
+
+        if key is not None:
+            self._member_references[key] = result
+        return result
 
-class MethodGroupReference(IOOPMemberReference, MethodGroup):
-    overloads: list[IMethod]
 
+def _substitute_signature(callee: IMethod, substitute: Callable[[TypeProtocol], TypeProtocol]) -> FunctionSignature:
+    signature = FunctionSignature(callee.name, substitute(callee.return_type))
+
+    for parameter in callee.positional_parameters:
+        signature.positional_parameters.append(Parameter(parameter.name, substitute(parameter.parameter_type), parameter.default_value))
+    for parameter in callee.named_parameters:
+        signature.named_parameters.append(Parameter(parameter.name, substitute(parameter.parameter_type), parameter.default_value))
+
+    if callee.variadic_positional_parameter:
+        signature.variadic_positional_parameter = Parameter(
+            callee.variadic_positional_parameter.name,
+            substitute(callee.variadic_positional_parameter.parameter_type)
+        )
+
+    if callee.variadic_named_parameter:
+        signature.variadic_named_parameter = Parameter(
+            callee.variadic_named_parameter.name,
+            substitute(callee.variadic_named_parameter.parameter_type)
+        )
+
+    return signature
+
+
+class MethodGroupReference(IOOPMemberReference, MethodGroup):
     def __init__(self, origin: MethodGroup, owner: IOOPReference = None):
         IOOPMemberReference.__init__(self, origin, owner)
-        MethodGroup.__init__(self, origin.name, owner=owner)
-        self.overloads = origin.overloads
+
+        # the overloads, and everything derived from them, belong to the origin group, so the group state
+        # (and the hooks on its overload list) is not initialized here.
+        self.name = origin.name
+        self._parent = None
+
+        self._member_references = {}
+        self._member_references_stamp = None
+
+        self.runtime_type = OverloadGroupType(self)
+
+    @property
+    def overloads(self) -> NotifyingList[IMethod]:
+        return self._definition.overloads
+
+    @overloads.setter
+    def overloads(self, value: list[IMethod]):
+        self._definition.overloads = value
+
+    def invalidate(self):
+        self._definition.invalidate()
+
+    def _get_index(self):
+        return self._definition._get_index()
+
+    def _get_cache(self):
+        return self._definition._get_cache()
+
+    def _get_specificity(self):
+        return self._definition._get_specificity()
+
+    def _stamp(self):
+        return self._definition._stamp()
 
     def match(
             self,
@@ -603,54 +1131,52 @@ class MethodGroupReference(IOOPMemberReference, MethodGroup):
             type_mappings: dict[GenericParameter, TypeProtocol] = None,
             **kwargs
     ) -> list[OverloadMatchResult[IOOPReference]]:
-        owner = self.owner
-        if type_mappings is None:
-            type_mappings = {}
-        if isinstance(owner, GenericClassInstance):
-            type_mappings.update(owner.generic_arguments)
+        type_mappings = self._get_type_mappings(type_mappings)
 
-        result = super().match(positional_arguments, named_arguments, strict=strict, allow_partial=allow_partial, recursive=recursive, **kwargs)
+        result = super().match(positional_arguments, named_arguments, strict=strict, allow_partial=allow_partial, recursive=recursive, type_mappings=type_mappings, **kwargs)
 
         for item in result:
-            callee = item.callee
-            item.callee = item.callee.get_reference(owner=self.owner)
+            self._bind_result(item, type_mappings)
 
-            if isinstance(item.call_instruction, vm.Call):
-                item.call_instruction.callee = item.callee
-            elif isinstance(item.call_instruction, vm.CreateInstance):
-                item.call_instruction.constructor = item.callee
-            else:
-                raise TypeError
+        return result
 
-            signature = FunctionSignature(callee.name, type_mappings.get(callee.return_type, callee.return_type))
-
-            for parameter in callee.positional_parameters:
-                signature.positional_parameters.append(Parameter(parameter.name, type_mappings.get(parameter.parameter_type, parameter.parameter_type), parameter.default_value))
-            for parameter in callee.named_parameters:
-                signature.named_parameters.append(Parameter(parameter.name, type_mappings.get(parameter.parameter_type, parameter.parameter_type), parameter.default_value))
-
-            if callee.variadic_positional_parameter:
-                signature.variadic_positional_parameter = Parameter(
-                    callee.variadic_positional_parameter.name,
-                    type_mappings.get(
-                        callee.variadic_positional_parameter.parameter_type,
-                        callee.variadic_positional_parameter.parameter_type
-                    )
-                )
-
-            if callee.variadic_named_parameter:
-                signature.variadic_named_parameter = Parameter(
-                    callee.variadic_named_parameter.name,
-                    type_mappings.get(
-                        callee.variadic_named_parameter.parameter_type,
-                        callee.variadic_named_parameter.parameter_type
-                    )
-                )
-
-            item.callee.signature = signature
+    def resolve(
+            self,
+            positional_arguments: list[Argument],
+            named_arguments: list[tuple[str, Argument]],
+            *,
+            strict: bool = False,
+            recursive: bool = False,
+            type_mappings: dict[GenericParameter, TypeProtocol] = None,
+            **kwargs
+    ) -> OverloadMatchResult[IOOPReference] | None:
+        type_mappings = self._get_type_mappings(type_mappings)
+
+        result = super().resolve(positional_arguments, named_arguments, strict=strict, recursive=recursive, type_mappings=type_mappings, **kwargs)
+
+        if result is not None:
+            self._bind_result(result, type_mappings)
 
         return result
 
+    def _get_type_mappings(self, type_mappings: dict[GenericParameter, TypeProtocol] | None) -> dict[GenericParameter, TypeProtocol]:
+        owner = self.owner
+        if type_mappings is None:
+            type_mappings = {}
+        if isinstance(owner, GenericClassInstance):
+            type_mappings.update(owner.generic_arguments)
+        return type_mappings
+
+    def _bind_result(self, item: OverloadMatchResult, type_mappings: dict[GenericParameter, TypeProtocol]):
+        item.callee = self._definition.get_member_reference(item.callee, self.owner, type_mappings)
+
+        if isinstance(item.call_instruction, vm.Call):
+            item.call_instruction.callee = item.callee
+        elif isinstance(item.call_instruction, vm.CreateInstance):
+            item.call_instruction.constructor = item.callee
+        else:
+            raise TypeError
+
 
 if __name__ == '__main__':
     from miniz.type_system import Void
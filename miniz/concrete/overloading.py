@@ -1,14 +1,33 @@
-from typing import Generic, TypeVar
+import weakref
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Callable, Generic, Iterable, TypeVar
 
 from miniz.core import TypeProtocol
 from miniz.generic import GenericParameter
 from miniz.interfaces.base import INamed
 from miniz.interfaces.overloading import Argument, OverloadMatchResult, IOverloaded
+from miniz.interfaces.signature import ISignature
 from miniz.ownership import Owned
+from miniz.template.unification import Unifier
+from utils import NotifyingList, VersionCounter
 
 _T = TypeVar("_T", bound=IOverloaded)
 
 
+def _get_unifier(overload: IOverloaded, type_mappings: dict[GenericParameter, TypeProtocol] | None) -> Unifier | None:
+    """
+    :return: A unifier for matching arguments to the parameters of the given overload, or `None` if the overload
+    is not generic and there are no known generic arguments.
+    """
+    variables = list(type_mappings or ())
+    if getattr(overload, "is_generic", False):
+        variables.extend(overload.generic_parameters)
+    if not variables:
+        return None
+    return Unifier.from_mapping(type_mappings or {}, variables)
+
+
 class OverloadGroupType(TypeProtocol):
     _group: "OverloadGroup"
 
@@ -26,91 +45,554 @@ class OverloadGroupType(TypeProtocol):
         ...
 
 
+def _is_plain_class(value: TypeProtocol) -> bool:
+    """
+    :return: Whether assignability to and from the given type is decided by subclassing alone.
+    """
+    from miniz.concrete.oop import Class
+
+    cls = type(value)
+    return issubclass(cls, Class) and cls.assignable_to is Class.assignable_to and cls.assignable_from is Class.assignable_from
+
+
+def _fits(
+        overload: IOverloaded,
+        args: list[TypeProtocol],
+        kwargs: list[tuple[str, TypeProtocol]],
+        compare_type: Callable[[TypeProtocol, TypeProtocol], bool]
+) -> bool:
+    plan = overload.signature.binder.plan(len(args), tuple(name for name, _ in kwargs))
+    if plan is None:
+        return False
+
+    targets = plan.targets
+    for arg, param in zip(args, targets):
+        if not compare_type(arg, param.parameter_type):
+            return False
+    for (_, arg), param in zip(kwargs, targets[len(args):]):
+        if not compare_type(arg, param.parameter_type):
+            return False
+    return True
+
+
+class _ArityNode:
+    """
+    The overloads which accept a given number of positional arguments, split by the type of the first positional
+    parameter whose type differs between them.
+    """
+
+    overloads: list
+    position: int | None
+    by_type: dict[TypeProtocol, list]
+    wildcard: list
+
+    def __init__(self, arity: int):
+        self.arity = arity
+        self.overloads = []
+        self.position = None
+        self.by_type = {}
+        self.wildcard = []
+
+    def add(self, overload):
+        self.overloads.append(overload)
+        if self.position is None:
+            self._build()
+        else:
+            self._insert(overload)
+
+    def candidates(self, args: list[TypeProtocol], strict: bool) -> list | None:
+        """
+        :return: The overloads which might accept the given arguments, or `None` if all of them might.
+        """
+        if self.position is None:
+            return None
+        arg = args[self.position]
+        if not _is_plain_class(arg):
+            return None
+        if strict:
+            return [*self.by_type.get(arg, ()), *self.wildcard]
+        by_type = self.by_type
+        result = [*self.wildcard]
+        for ancestor in arg.ancestors:
+            result.extend(by_type.get(ancestor, ()))
+        return result
+
+    def _build(self):
+        if len(self.overloads) < 2:
+            return
+        for position in range(self.arity):
+            types = {overload.signature.positional_parameters[position].parameter_type for overload in self.overloads}
+            if len(types) > 1:
+                break
+        else:
+            return
+        self.position = position
+        for overload in self.overloads:
+            self._insert(overload)
+
+    def _insert(self, overload):
+        parameter_type = overload.signature.positional_parameters[self.position].parameter_type
+        if _is_plain_class(parameter_type):
+            self.by_type.setdefault(parameter_type, []).append(overload)
+        else:
+            self.wildcard.append(overload)
+
+
+class _OverloadIndex:
+    """
+    Narrows down the overloads of a group before their parameter types are compared with the arguments.
+
+    Overloads are bucketed by the number of positional arguments they accept. Within a bucket, an argument of a class
+    type only selects the overloads whose discriminating parameter is one of the ancestors of the class (or is not a
+    class at all).
+    """
+
+    _order: dict[object, int]
+    _fixed: dict[int, _ArityNode]
+    _variadic: list[tuple[int, object]]
+
+    def __init__(self, overloads: Iterable = ()):
+        self._order = {}
+        self._fixed = {}
+        self._variadic = []
+        for overload in overloads:
+            self.add(overload)
+
+    def add(self, overload):
+        self._order[overload] = len(self._order)
+
+        positional = overload.signature.positional_parameters
+        minimum = len(positional)
+        while minimum and positional[minimum - 1].has_default_value:
+            minimum -= 1
+
+        if overload.signature.variadic_positional_parameter is not None:
+            self._variadic.append((minimum, overload))
+            return
+        for arity in range(minimum, len(positional) + 1):
+            try:
+                node = self._fixed[arity]
+            except KeyError:
+                node = self._fixed[arity] = _ArityNode(arity)
+            node.add(overload)
+
+    def candidates(self, args: list[TypeProtocol], strict: bool, typed: bool) -> list:
+        """
+        :param typed: Whether the argument types may be used to filter the overloads. This is not the case when
+        parameter types are substituted before they are compared.
+        :return: The overloads which might accept the given positional arguments, in the order they were added.
+        """
+        arity = len(args)
+        node = self._fixed.get(arity)
+
+        result = None
+        if node is not None:
+            if typed:
+                result = node.candidates(args, strict)
+            if result is None:
+                result = node.overloads
+        variadic = [overload for minimum, overload in self._variadic if minimum <= arity]
+        if variadic:
+            result = [*result, *variadic] if result else variadic
+        elif result is None:
+            return []
+        elif result is node.overloads:
+            return result
+
+        return sorted(result, key=self._order.__getitem__)
+
+
+def _is_subtype(source: TypeProtocol, target: TypeProtocol) -> bool:
+    """
+    :return: Whether every value of `source` is a value of `target`. Unlike assignability, this doesn't consider
+    implicit conversions (such as constructors).
+    """
+    from miniz.concrete.oop import Class
+    from miniz.interfaces.oop import OOPImplementable
+    from miniz.type_system import Any, IntersectionType, Null, Nullable, UnionType
+
+    if source is target or target is Any:
+        return True
+    if isinstance(source, UnionType):
+        return all(_is_subtype(member, target) for member in source.members)
+    if isinstance(target, IntersectionType):
+        return all(_is_subtype(source, member) for member in target.members)
+    if isinstance(source, IntersectionType):
+        return any(_is_subtype(member, target) for member in source.members)
+    if isinstance(target, UnionType):
+        return any(_is_subtype(source, member) for member in target.members)
+    if isinstance(target, Nullable):
+        if isinstance(source, Nullable):
+            return _is_subtype(source.type, target.type)
+        return source is Null or _is_subtype(source, target.type)
+    if isinstance(source, Class):
+        if isinstance(target, Class):
+            return source.is_subclass_of(target)
+        if isinstance(target, OOPImplementable):
+            return source.get_itable(target) is not None
+    return False
+
+
+def _corresponding_parameters(signature: ISignature, other: ISignature) -> list[tuple] | None:
+    """
+    :return: The pairs of parameters of the two signatures which receive the same argument, or `None` if a parameter
+    of `signature`, or a parameter of `other` which is not variadic, doesn't have a counterpart.
+    """
+    result = []
+
+    positional, other_positional = signature.positional_parameters, other.positional_parameters
+    for index in range(max(len(positional), len(other_positional))):
+        parameter = positional[index] if index < len(positional) else signature.variadic_positional_parameter
+        other_parameter = other_positional[index] if index < len(other_positional) else other.variadic_positional_parameter
+        if parameter is None or other_parameter is None:
+            return None
+        result.append((parameter, other_parameter))
+
+    named = {parameter.name: parameter for parameter in signature.named_parameters}
+    other_named = {parameter.name: parameter for parameter in other.named_parameters}
+    for name in named.keys() | other_named.keys():
+        parameter = named.get(name, signature.variadic_named_parameter)
+        other_parameter = other_named.get(name, other.variadic_named_parameter)
+        if parameter is None or other_parameter is None:
+            return None
+        result.append((parameter, other_parameter))
+
+    for parameter, other_parameter in (
+            (signature.variadic_positional_parameter, other.variadic_positional_parameter),
+            (signature.variadic_named_parameter, other.variadic_named_parameter)
+    ):
+        if parameter is not None:
+            if other_parameter is None:
+                return None
+            result.append((parameter, other_parameter))
+
+    return result
+
+
+def _is_more_specific(overload: IOverloaded, other: IOverloaded) -> bool:
+    """
+    :return: Whether every parameter of `overload` is a subtype of the corresponding parameter of `other`, and either
+    one of them is a strict subtype or `other` has a variadic parameter `overload` doesn't have.
+    """
+    signature, other_signature = overload.signature, other.signature
+
+    pairs = _corresponding_parameters(signature, other_signature)
+    if pairs is None:
+        return False
+
+    strict = (
+            signature.variadic_positional_parameter is None and other_signature.variadic_positional_parameter is not None or
+            signature.variadic_named_parameter is None and other_signature.variadic_named_parameter is not None
+    )
+    for parameter, other_parameter in pairs:
+        if not _is_subtype(parameter.parameter_type, other_parameter.parameter_type):
+            return False
+        if not _is_subtype(other_parameter.parameter_type, parameter.parameter_type):
+            strict = True
+    return strict
+
+
+class AmbiguousOverloadError(TypeError):
+    """
+    Raised when more than one overload applies to a call and none of them is more specific than all the others.
+    """
+
+    candidates: list["OverloadCandidate"]
+
+    def __init__(self, candidates: list["OverloadCandidate"]):
+        super().__init__(f"Ambiguous call, candidates are: {', '.join(str(candidate.overload) for candidate in candidates)}")
+        self.candidates = candidates
+
+
+class _SpecificityOrder:
+    """
+    The overloads of a group, partially ordered by `_is_more_specific`. Each overload is assigned a bit, so the
+    overloads which are more specific than an overload are stored as a mask.
+    """
+
+    __slots__ = ("bits", "dominators")
+
+    bits: dict[object, int]
+    dominators: dict[object, int]
+
+    def __init__(self, overloads: list):
+        self.bits = {overload: 1 << i for i, overload in enumerate(overloads)}
+        self.dominators = {
+            overload: sum(self.bits[other] for other in overloads if other is not overload and _is_more_specific(other, overload))
+            for overload in overloads
+        }
+
+    def mask(self, overloads: Iterable) -> int:
+        result = 0
+        for overload in overloads:
+            result |= self.bits.get(overload, 0)
+        return result
+
+    def count_dominators(self, overload, mask: int) -> int:
+        """
+        :return: The number of overloads in `mask` which are more specific than the given overload.
+        """
+        return (self.dominators.get(overload, 0) & mask).bit_count()
+
+    def maximal(self, overloads: list) -> list:
+        """
+        :return: The overloads which no other of the given overloads is more specific than.
+        """
+        mask = self.mask(overloads)
+        dominators = self.dominators
+        return [overload for overload in overloads if not dominators.get(overload, 0) & mask]
+
+
+@dataclass(slots=True, frozen=True)
+class OverloadCandidate(Generic[_T]):
+    """
+    An overload which accepts the types of the arguments of a call. Unlike an `OverloadMatchResult`, a candidate
+    doesn't hold the code of the call until it is materialized.
+    """
+
+    overload: _T
+    group: "OverloadGroup[_T]"
+
+    def materialize(
+            self,
+            positional_arguments: list[Argument],
+            named_arguments: list[tuple[str, Argument]],
+            *,
+            strict: bool = False,
+            type_mappings: dict[GenericParameter, TypeProtocol] = None,
+            **kwargs
+    ) -> OverloadMatchResult[_T] | None:
+        return self.overload.match(positional_arguments, named_arguments, strict=strict, type_mappings=type_mappings, **kwargs)
+
+
+_MISSING = object()
+
+
+def _resolution_key(args, kwargs, type_mappings, *flags) -> tuple | None:
+    """
+    :return: The key under which the resolution of a call with the given argument types is cached, or `None` if it
+    can't be cached.
+    """
+    key = tuple(args), tuple(kwargs), frozenset(type_mappings.items()) if type_mappings else None, *flags
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+class _ResolutionCache:
+    """
+    The results of overload resolution in a group. The results are valid as long as the stamp they were computed with
+    (see `OverloadGroup._stamp`) is current.
+    """
+
+    __slots__ = ("stamp", "entries")
+
+    stamp: tuple[int, ...] | None
+    entries: dict[tuple, object]
+
+    def __init__(self):
+        self.stamp = None
+        self.entries = {}
+
+    def get(self, stamp: tuple[int, ...], key: tuple):
+        if stamp != self.stamp:
+            self.entries.clear()
+            self.stamp = stamp
+            return _MISSING
+        return self.entries.get(key, _MISSING)
+
+
 class OverloadGroup(Owned, INamed, Generic[_T]):
-    overloads: list[_T]
-    parent: "OverloadGroup | None"
+    _parent: "OverloadGroup | None"
+
+    _overloads: NotifyingList[_T]
+    _index: _OverloadIndex | None
+    _version: VersionCounter
+    _cache: _ResolutionCache
+    _watched: "weakref.WeakSet[ISignature]"
+    _specificity: _SpecificityOrder | None
+    _specificity_stamp: tuple[int, ...] | None
 
     def __init__(self, name: str, parent: "OverloadGroup | None", *, owner=None):
         super().__init__(owner=owner)
         self.name = name
+
+        self._overloads = None
+        self._index = None
+        self._version = VersionCounter()
+        self._cache = _ResolutionCache()
+        self._specificity = None
+        self._specificity_stamp = None
+
         self.parent = parent
-        self.overloads = []
+
+        self._watched = weakref.WeakSet()
+
+        def on_add_overload(_, overload: _T):
+            self._watch(overload)
+            if self._index is not None:
+                self._index.add(overload)
+            self._version.bump()
+
+        def on_change_overloads(*_):
+            self.invalidate()
+
+        def on_signature_changed(_):
+            self.invalidate()
+
+        self.__on_add_overload = on_add_overload
+        self.__on_change_overloads = on_change_overloads
+        self.__on_signature_changed = on_signature_changed
+
+        self._set_overloads(NotifyingList())
 
         self.runtime_type = OverloadGroupType(self)
 
-    def get_match(self, args: list["TypeProtocol"], kwargs: list[tuple[str, "TypeProtocol"]], *, strict: bool = False, recursive: bool = False) -> list[_T]:
+    @property
+    def overloads(self) -> NotifyingList[_T]:
+        return self._overloads
+
+    @overloads.setter
+    def overloads(self, value: list[_T]):
+        self._set_overloads(value)
+
+    @property
+    def parent(self) -> "OverloadGroup | None":
+        return self._parent
+
+    @parent.setter
+    def parent(self, value: "OverloadGroup | None"):
+        self._parent = value
+        self._version.bump()
+
+    def invalidate(self):
+        """
+        Drops the cached resolution results of this group and of the groups whose parent chain contains it. This is
+        done automatically when `overloads` is modified, but must be called if the signature of an overload is modified
+        after it was added to the group.
+        """
+        self._index = None
+        self._version.bump()
+
+    def get_match(
+            self,
+            args: list["TypeProtocol"],
+            kwargs: list[tuple[str, "TypeProtocol"]],
+            *,
+            strict: bool = False,
+            recursive: bool = False,
+            type_mappings: dict[GenericParameter, TypeProtocol] = None
+    ) -> list[_T]:
+        """
+        :param type_mappings: Known generic arguments. Parameter types are resolved with these, and the generic
+        parameters of generic overloads are inferred from the arguments by unification.
+        """
+        key = _resolution_key(args, kwargs, type_mappings, strict, recursive)
+        if key is None:
+            return self._get_match(args, kwargs, strict, recursive, type_mappings)
+
+        cache = self._get_cache()
+        result = cache.get(self._stamp(), key)
+        if result is _MISSING:
+            result = cache.entries[key] = tuple(self._get_match(args, kwargs, strict, recursive, type_mappings))
+        return list(result)
+
+    def _get_match(self, args, kwargs, strict, recursive, type_mappings) -> list[_T]:
         from miniz.type_system import assignable_to, are_identical
 
         if recursive:
-            overloads = self.get_match(args, kwargs, strict=strict, recursive=False)
+            overloads = self.get_match(args, kwargs, strict=strict, recursive=False, type_mappings=type_mappings)
             if not overloads:
                 if self.parent is None:
                     return []
-                return self.parent.get_match(args, kwargs, strict=strict, recursive=recursive)
+                return self.parent.get_match(args, kwargs, strict=strict, recursive=recursive, type_mappings=type_mappings)
             return overloads
 
-        compare_type = assignable_to if not strict else are_identical
+        assignable = assignable_to if not strict else are_identical
 
         overloads = []
-        for overload in self.overloads:
-            fits = True
-
-            sig = overload.signature
-            if len(args) > len(sig.positional_parameters) and sig.variadic_positional_parameter is None:
-                continue
-            if len(kwargs) > len(sig.named_parameters) and sig.variadic_named_parameter is None:
-                continue
-
-            for arg, param in zip(args, sig.positional_parameters):
-                if not compare_type(arg, param.parameter_type):
-                    fits = False
-                    break
-            if len(args) > len(sig.positional_parameters):
-                for arg in args[len(sig.positional_parameters):]:
-                    if not compare_type(arg, sig.variadic_positional_parameter.parameter_type):
-                        fits = False
-                        break
-            elif len(args) < len(sig.positional_parameters):
-                for param in sig.positional_parameters[len(args):]:
-                    if not param.has_default_value:
-                        fits = False
-                        break
-            if not fits:
-                continue
-
-            kw_params = {
-                param.name: param for param in sig.named_parameters
-            }
-            for name, arg in kwargs:
-                try:
-                    param = kw_params[name]
-                except KeyError:
-                    if sig.variadic_named_parameter is None:
-                        fits = False
-                        break
-                    param = sig.variadic_named_parameter
-                if not compare_type(arg, param.parameter_type):
-                    fits = False
-                    break
+        for overload in self._get_index().candidates(args, strict, not type_mappings):
+            unifier = _get_unifier(overload, type_mappings)
+            if unifier is None:
+                compare_type = assignable
             else:
-                if len(kwargs) > len(sig.named_parameters):
-                    for arg in args[len(sig.named_parameters):]:
-                        if not compare_type(arg, sig.variadic_positional_parameter.parameter_type):
-                            fits = False
-                            break
-                elif len(kwargs) < len(sig.named_parameters):
-                    for param in sig.named_parameters[len(kwargs):]:
-                        if not param.has_default_value:
-                            fits = False
-                            break
-
-            if not fits:
-                continue
-
-            overloads.append(overload)
+                def compare_type(arg: TypeProtocol, parameter_type: TypeProtocol, _unifier=unifier):
+                    parameter_type = _unifier.resolve(parameter_type)
+                    if _unifier.has_variables(parameter_type):
+                        return _unifier.unify(parameter_type, arg)
+                    return assignable(arg, parameter_type)
+
+            if _fits(overload, args, kwargs, compare_type):
+                overloads.append(overload)
 
         return overloads
 
+    def _get_index(self) -> _OverloadIndex:
+        if self._index is None:
+            for overload in self.overloads:
+                self._watch(overload)
+            self._index = _OverloadIndex(self.overloads)
+        return self._index
+
+    def _get_cache(self) -> _ResolutionCache:
+        return self._cache
+
+    def _get_specificity(self) -> _SpecificityOrder:
+        stamp = self._stamp()
+        if self._specificity is None or self._specificity_stamp != stamp:
+            for overload in self.overloads:
+                self._watch(overload)
+            self._specificity = _SpecificityOrder(self.overloads)
+            self._specificity_stamp = stamp
+        return self._specificity
+
+    def _stamp(self) -> tuple[int, ...]:
+        """
+        :return: The versions of everything the resolution results of this group depend on.
+        """
+        from miniz.interfaces.oop import type_version
+
+        stamp = [type_version.value]
+        group = self
+        while group is not None:
+            stamp.append(group._version.value)
+            group = group.parent
+        return tuple(stamp)
+
+    def _watch(self, overload: _T):
+        """
+        Makes changes to the parameters of the given overload invalidate this group, since the index, the cached
+        results and the specificity order are all derived from them.
+        """
+        signature = overload.signature
+        if signature not in self._watched:
+            self._watched.add(signature)
+            signature.parameters_changed += self.__on_signature_changed
+
+    def _set_overloads(self, overloads: list[_T]):
+        if self._overloads is not None:
+            self._overloads.append -= self.__on_add_overload
+            self._overloads.extend -= self.__on_change_overloads
+            self._overloads.remove -= self.__on_change_overloads
+            self._overloads.pop -= self.__on_change_overloads
+            self._overloads.__setitem__ -= self.__on_change_overloads
+            self._overloads.__delitem__ -= self.__on_change_overloads
+
+        if not isinstance(overloads, NotifyingList):
+            overloads = NotifyingList(overloads)
+
+        overloads.append += self.__on_add_overload
+        overloads.extend += self.__on_change_overloads
+        overloads.remove += self.__on_change_overloads
+        overloads.pop += self.__on_change_overloads
+        overloads.__setitem__ += self.__on_change_overloads
+        overloads.__delitem__ += self.__on_change_overloads
+
+        self._overloads = overloads
+        self.invalidate()
+
     def match(
             self,
             positional_arguments: list[Argument],
@@ -122,29 +604,185 @@ class OverloadGroup(Owned, INamed, Generic[_T]):
             type_mappings: dict[GenericParameter, TypeProtocol] = None,
             **kwargs
     ) -> list[OverloadMatchResult[_T]]:
+        key = _resolution_key(
+            [arg.type for arg in positional_arguments],
+            [(name, arg.type) for name, arg in named_arguments],
+            type_mappings, strict, allow_partial, tuple(kwargs.items())
+        )
+        cache = self._get_cache()
+
         if recursive:
-            result = self.match(positional_arguments, named_arguments, strict=strict, recursive=False, type_mappings=type_mappings, **kwargs)
+            group = _MISSING if key is None else cache.get(self._stamp(), (key, True))
+            if group is not _MISSING:
+                if group is None:
+                    return []
+                return group.match(positional_arguments, named_arguments, strict=strict, allow_partial=allow_partial, recursive=False, type_mappings=type_mappings, **kwargs)
 
-            if not result:
-                if self.parent:
-                    return self.parent.match(positional_arguments, named_arguments, strict=strict, recursive=True, type_mappings=type_mappings, **kwargs)
-                return []
+            group = self
+            while group is not None:
+                result = group.match(positional_arguments, named_arguments, strict=strict, allow_partial=allow_partial, recursive=False, type_mappings=type_mappings, **kwargs)
+                if result:
+                    break
+                group = group.parent
+            else:
+                result = []
 
+            if key is not None:
+                cache.entries[key, True] = group
             return result
 
+        overloads = _MISSING if key is None else cache.get(self._stamp(), (key, False))
+        if overloads is _MISSING:
+            overloads = self.overloads
+
+        # only the overloads are cached, since the results contain the code of the arguments
+        matched = []
         result = []
+        for overload in overloads:
+            match = overload.match(positional_arguments, named_arguments, strict=strict, type_mappings=type_mappings, **kwargs)
 
-        if allow_partial:
-            for overload in self.overloads:
-                match = overload.match(positional_arguments, named_arguments, strict=strict, type_mappings=type_mappings, **kwargs)
+            if match is not None and (allow_partial or match.is_full_match):
+                matched.append(overload)
+                result.append(match)
 
-                if match is not None:
-                    result.append(match)
-        else:
-            for overload in self.overloads:
-                match = overload.match(positional_arguments, named_arguments, strict=strict, type_mappings=type_mappings, **kwargs)
+        if key is not None:
+            cache.entries[key, False] = tuple(matched)
+        return result
+
+    def get_candidates(
+            self,
+            args: list["TypeProtocol"],
+            kwargs: list[tuple[str, "TypeProtocol"]],
+            *,
+            strict: bool = False,
+            recursive: bool = False,
+            type_mappings: dict[GenericParameter, TypeProtocol] = None
+    ) -> list[OverloadCandidate[_T]]:
+        """
+        The first phase of `resolve`. Only the types of the arguments are checked, so nothing is allocated for the
+        overloads which don't apply.
+        """
+        group = self
+        while group is not None:
+            overloads = group.get_match(args, kwargs, strict=strict, recursive=False, type_mappings=type_mappings)
+            if overloads or not recursive:
+                return [OverloadCandidate(overload, group) for overload in overloads]
+            group = group.parent
+        return []
+
+    @staticmethod
+    def rank(candidates: list[OverloadCandidate[_T]]) -> list[OverloadCandidate[_T]]:
+        """
+        The second phase of `resolve`.
+
+        :return: The given candidates, where each candidate comes after all the candidates which are more specific
+        than it.
+        """
+        if len(candidates) < 2:
+            return candidates
+        order = candidates[0].group._get_specificity()
+        mask = order.mask(candidate.overload for candidate in candidates)
+        return sorted(candidates, key=lambda candidate: order.count_dominators(candidate.overload, mask))
+
+    @staticmethod
+    def most_specific(candidates: list[OverloadCandidate[_T]]) -> OverloadCandidate[_T] | None:
+        """
+        :return: The candidate which is more specific than all the others, or `None` if there are no candidates.
+        :raises AmbiguousOverloadError: if there is no such candidate.
+        """
+        if len(candidates) < 2:
+            return candidates[0] if candidates else None
+        order = candidates[0].group._get_specificity()
+        by_overload = {candidate.overload: candidate for candidate in candidates}
+        best = order.maximal(list(by_overload))
+        if len(best) != 1:
+            raise AmbiguousOverloadError([by_overload[overload] for overload in best])
+        return by_overload[best[0]]
+
+    def resolve(
+            self,
+            positional_arguments: list[Argument],
+            named_arguments: list[tuple[str, Argument]],
+            *,
+            strict: bool = False,
+            recursive: bool = False,
+            type_mappings: dict[GenericParameter, TypeProtocol] = None,
+            **kwargs
+    ) -> OverloadMatchResult[_T] | None:
+        """
+        Like `match`, but only the best overload is materialized into an `OverloadMatchResult`.
+
+        :return: The full match of the most specific applicable overload, or `None` if no overload applies.
+        :raises AmbiguousOverloadError: if no applicable overload is more specific than all the others.
+        """
+        candidates = self.get_candidates(
+            [arg.type for arg in positional_arguments],
+            [(name, arg.type) for name, arg in named_arguments],
+            strict=strict, recursive=recursive, type_mappings=type_mappings
+        )
+
+        while candidates:
+            candidate = self.most_specific(candidates)
+            result = candidate.materialize(positional_arguments, named_arguments, strict=strict, type_mappings=type_mappings, **kwargs)
+            if result is not None and result.is_full_match:
+                return result
+            candidates.remove(candidate)
+
+        return None
 
-                if match is not None and match.is_full_match:
-                    result.append(match)
 
+@dataclass(slots=True, frozen=True)
+class CallSite:
+    """
+    A call whose overload is yet to be resolved, described only by the types of its arguments.
+    """
+
+    group: OverloadGroup
+    args: tuple[TypeProtocol, ...]
+    kwargs: tuple[tuple[str, TypeProtocol], ...] = ()
+    type_mappings: tuple[tuple[GenericParameter, TypeProtocol], ...] = ()
+
+
+def resolve_overloads(
+        sites: Iterable[CallSite],
+        *,
+        strict: bool = False,
+        recursive: bool = False,
+        executor: Executor = None
+) -> list[list[OverloadCandidate]]:
+    """
+    Resolves many call sites at once. Identical call sites are resolved only once, and the call sites of each group
+    are resolved together, so the lazily built index and specificity order of a group are built once.
+
+    :param executor: If given, the groups are resolved in parallel on this executor. Since the groups and the caches of
+    the type system are shared with the caller, this should be a thread pool.
+    :return: The most specific candidates of each call site, in order. A single candidate means that the call is
+    resolved, no candidates that no overload applies and more than one that the call is ambiguous.
+    """
+    sites = list(sites)
+
+    by_group: dict[OverloadGroup, dict[CallSite, None]] = {}
+    for site in sites:
+        by_group.setdefault(site.group, {})[site] = None
+
+    def resolve_group(group_sites: dict[CallSite, None]) -> list[tuple[CallSite, list[OverloadCandidate]]]:
+        result = []
+        for site in group_sites:
+            candidates = site.group.get_candidates(
+                list(site.args), list(site.kwargs), strict=strict, recursive=recursive, type_mappings=dict(site.type_mappings)
+            )
+            if len(candidates) > 1:
+                try:
+                    candidates = [site.group.most_specific(candidates)]
+                except AmbiguousOverloadError as e:
+                    candidates = e.candidates
+            result.append((site, candidates))
         return result
+
+    if executor is None:
+        resolved = map(resolve_group, by_group.values())
+    else:
+        resolved = executor.map(resolve_group, by_group.values())
+
+    results = {site: candidates for group_results in resolved for site, candidates in group_results}
+    return [list(results[site]) for site in sites]
@@ -1,6 +1,8 @@
-from miniz.interfaces.signature import ISignature, IParameter
+from dataclasses import dataclass
+
+from miniz.interfaces.signature import ISignature, IParameter, ParameterKind
 from miniz.core import TypeProtocol, ObjectProtocol
-from utils import NotifyingList
+from utils import IndexedList, event
 
 
 class Parameter(IParameter):
@@ -17,7 +19,7 @@ class Parameter(IParameter):
     def index(self):
         if self.owner is None:
             raise ValueError(f"Parameter currently doesn't have an index")
-        return self.owner.parameters.index(self)
+        return self.owner.index_of(self)
 
     @property
     def has_default_value(self):
@@ -27,11 +29,123 @@ class Parameter(IParameter):
         return f"{self.name}: {self.parameter_type}" + (f" = {self.default_value}" if self.default_value is not None else "")
 
 
+@dataclass(slots=True, frozen=True)
+class BindingPlan:
+    """
+    How the arguments of one call shape are assigned to the parameters of a signature.
+    """
+
+    targets: tuple[IParameter, ...]
+    """
+    The parameter which receives each argument, positional arguments first and then keyword arguments. Arguments which
+    are packed into a variadic parameter target that parameter.
+    """
+
+    positional_count: int
+    """
+    The number of positional arguments which are bound to positional parameters.
+    """
+
+    variadic_positional: IParameter | None
+    variadic_named: IParameter | None
+
+    defaults: tuple[IParameter, ...]
+    """
+    The parameters which are not given an argument and take their default value.
+    """
+
+
+class Binder:
+    """
+    Assigns the arguments of calls to the parameters of a signature. The assignment only depends on the number of
+    positional arguments and the names of the keyword arguments, so a plan is computed once for each such call shape.
+    """
+
+    signature: ISignature
+
+    _plans: dict[tuple[int, tuple[str, ...]], BindingPlan | None]
+
+    def __init__(self, signature: ISignature):
+        self.signature = signature
+        self._plans = {}
+
+    def plan(self, positional_count: int, names: tuple[str, ...] = ()) -> BindingPlan | None:
+        """
+        :return: The plan for calls with the given shape, or `None` if the signature doesn't accept such calls.
+        """
+        key = positional_count, names
+        try:
+            return self._plans[key]
+        except KeyError:
+            result = self._plans[key] = self._build_plan(positional_count, names)
+            return result
+
+    def bind(self, args: list[ObjectProtocol], kwargs: dict[str, ObjectProtocol] | list[tuple[str, ObjectProtocol]] = ()) -> dict[IParameter, ObjectProtocol]:
+        """
+        :return: The value of each parameter of the signature. Variadic positional arguments are packed into a tuple
+        and variadic keyword arguments into a dict.
+        :raises TypeError: if the signature doesn't accept the given arguments.
+        """
+        kwargs = list(kwargs.items()) if isinstance(kwargs, dict) else kwargs
+        plan = self.plan(len(args), tuple(name for name, _ in kwargs))
+        if plan is None:
+            raise TypeError(f"Arguments don't match the signature {self.signature}")
+
+        count = plan.positional_count
+        result = {parameter: parameter.default_value for parameter in plan.defaults}
+        result.update(zip(plan.targets[:count], args))
+        if plan.variadic_positional is not None:
+            result[plan.variadic_positional] = tuple(args[count:])
+        if plan.variadic_named is not None:
+            packed = result[plan.variadic_named] = {}
+            for (name, value), parameter in zip(kwargs, plan.targets[len(args):]):
+                if parameter is plan.variadic_named:
+                    packed[name] = value
+                else:
+                    result[parameter] = value
+        else:
+            result.update((parameter, value) for (_, value), parameter in zip(kwargs, plan.targets[len(args):]))
+        return result
+
+    def _build_plan(self, positional_count: int, names: tuple[str, ...]) -> BindingPlan | None:
+        sig = self.signature
+        positional = sig.positional_parameters
+        variadic_positional = sig.variadic_positional_parameter
+        variadic_named = sig.variadic_named_parameter
+
+        if positional_count > len(positional) and variadic_positional is None:
+            return None
+        if len(set(names)) != len(names):
+            return None
+        count = min(positional_count, len(positional))
+        targets = [*positional[:count], *(variadic_positional for _ in range(positional_count - count))]
+        defaults = list(positional[count:])
+
+        named = {
+            parameter.name: parameter for parameter in sig.named_parameters
+        }
+        for name in names:
+            parameter = named.pop(name, None)
+            if parameter is None:
+                if variadic_named is None:
+                    return None
+                parameter = variadic_named
+            targets.append(parameter)
+        defaults.extend(named.values())
+
+        if not all(parameter.has_default_value for parameter in defaults):
+            return None
+
+        return BindingPlan(tuple(targets), count, variadic_positional, variadic_named, tuple(defaults))
+
+
 class Signature(ISignature):
     _parameters: dict[str, Parameter]
+    _binder: Binder | None
+    _parameters_view: tuple[Parameter, ...] | None
 
-    _positional_parameters: NotifyingList[Parameter]
-    _named_parameters: NotifyingList[Parameter]
+    _positional_parameters: IndexedList[Parameter]
+    _named_parameters: IndexedList[Parameter]
 
     _variadic_positional_parameter: Parameter | None
     _variadic_named_parameter: Parameter | None
@@ -40,22 +154,55 @@ class Signature(ISignature):
         self.name = name
 
         self._parameters = {}
+        self._binder = None
+        self._parameters_view = None
 
-        self._positional_parameters = NotifyingList()
-        self._named_parameters = NotifyingList()
+        self._positional_parameters = IndexedList()
+        self._named_parameters = IndexedList()
 
-        def on_new_parameter(_, parameter: Parameter):
+        def on_new_parameter(ps, parameter: Parameter):
             if parameter.name in self._parameters:
                 raise ValueError(f"Parameter \'{parameter.name}\' already exists on {self}")
             self._parameters[parameter.name] = parameter
+            self._binder = self._parameters_view = None
+            self.parameters_changed()
             parameter.owner = self
+            if ps is self._positional_parameters:
+                parameter.kind = ParameterKind.Positional
+            elif ps is self._named_parameters:
+                parameter.kind = ParameterKind.Named
 
         def on_remove_parameter(ps, parameter: int | Parameter):
             if isinstance(parameter, int):
                 parameter = ps[parameter]
             assert isinstance(parameter, Parameter)
             del self._parameters[parameter.name]
+            self._binder = self._parameters_view = None
+            self.parameters_changed()
             parameter.owner = None
+            parameter.kind = None
+
+        def on_extend_parameters(ps, parameters):
+            if iter(parameters) is parameters:
+                raise TypeError("Parameters must be added from a collection, not from an iterator")
+            for parameter in parameters:
+                on_new_parameter(ps, parameter)
+
+        def on_set_parameter(ps, key: int | slice, value):
+            if isinstance(key, slice):
+                if iter(value) is value:
+                    raise TypeError("Parameters must be added from a collection, not from an iterator")
+                old, new = ps[key], value
+            else:
+                old, new = [ps[key]], [value]
+            for parameter in old:
+                on_remove_parameter(ps, parameter)
+            for parameter in new:
+                on_new_parameter(ps, parameter)
+
+        def on_delete_parameter(ps, key: int | slice):
+            for parameter in ps[key] if isinstance(key, slice) else [ps[key]]:
+                on_remove_parameter(ps, parameter)
 
         self._positional_parameters.append += on_new_parameter
         self._named_parameters.append += on_new_parameter
@@ -65,19 +212,40 @@ class Signature(ISignature):
         self._positional_parameters.remove += on_remove_parameter
         self._named_parameters.remove += on_remove_parameter
 
+        self._positional_parameters.extend += on_extend_parameters
+        self._named_parameters.extend += on_extend_parameters
+        self._positional_parameters.__setitem__ += on_set_parameter
+        self._named_parameters.__setitem__ += on_set_parameter
+        self._positional_parameters.__delitem__ += on_delete_parameter
+        self._named_parameters.__delitem__ += on_delete_parameter
+
         self.__on_new_parameter = on_new_parameter
         self.__on_remove_parameter = on_remove_parameter
 
         self._variadic_positional_parameter = self._variadic_named_parameter = None
 
     @property
-    def parameters(self) -> list[Parameter]:
-        result = [*self.positional_parameters, *self.named_parameters]
-        if self.variadic_positional_parameter:
-            result.append(self.variadic_positional_parameter)
-        if self.variadic_named_parameter:
-            result.append(self.variadic_named_parameter)
-        return result
+    def parameters(self) -> tuple[Parameter, ...]:
+        if self._parameters_view is None:
+            result = [*self._positional_parameters, *self._named_parameters]
+            if self._variadic_positional_parameter is not None:
+                result.append(self._variadic_positional_parameter)
+            if self._variadic_named_parameter is not None:
+                result.append(self._variadic_named_parameter)
+            self._parameters_view = tuple(result)
+        return self._parameters_view
+
+    @event
+    def parameters_changed(self):
+        """
+        Called whenever parameters are added to or removed from this signature.
+        """
+
+    @property
+    def binder(self) -> Binder:
+        if self._binder is None:
+            self._binder = Binder(self)
+        return self._binder
 
     @property
     def positional_parameters(self):
@@ -102,6 +270,7 @@ class Signature(ISignature):
             if self.variadic_positional_parameter is not None:
                 self.variadic_positional_parameter = None
             self.__on_new_parameter(None, value)
+            value.kind = ParameterKind.VariadicPositional
             self._variadic_positional_parameter = value
 
     @property
@@ -119,6 +288,7 @@ class Signature(ISignature):
             if self.variadic_named_parameter is not None:
                 self.variadic_named_parameter = None
             self.__on_new_parameter(None, value)
+            value.kind = ParameterKind.VariadicNamed
             self._variadic_named_parameter = value
 
     def __repr__(self):
@@ -1,7 +1,7 @@
 from typing import Generic, TypeVar
 
 from miniz.core import TypeProtocol, ObjectProtocol
-from miniz.interfaces.signature import IParameter
+from miniz.interfaces.signature import IParameter, ParameterKind
 from miniz.ownership import Owned
 from utils import NotifyingList
 
@@ -104,12 +104,14 @@ class GenericSignature(Owned["IFunction"]):
             if any(p.name == parameter.name for p in self._positional_parameters):
                 raise ValueError(f"Parameter \'{parameter.name}\' already exists on {self}")
             parameter.owner = self
+            parameter.kind = ParameterKind.Positional
 
         def on_remove_parameter(ps, parameter: int | GenericParameter):
             if isinstance(parameter, int):
                 parameter = ps[parameter]
             assert isinstance(parameter, GenericParameter)
             parameter.owner = None
+            parameter.kind = None
 
         self._positional_parameters.append += on_new_parameter
 
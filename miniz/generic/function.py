@@ -1,10 +1,12 @@
 import typing
+from types import MappingProxyType
 
 from miniz.concrete.function_signature import FunctionSignature
 from miniz.concrete.signature import Parameter
 from miniz.core import TypeProtocol
 from miniz.generic.core import GenericInstance
 from miniz.interfaces.signature import IParameter
+from utils import InternMeta
 
 if typing.TYPE_CHECKING:
     from miniz.interfaces.function import IFunction
@@ -23,14 +25,46 @@ class GenericFunctionInstanceType(TypeProtocol):
         ...
 
 
-class GenericFunctionInstance(GenericInstance):
+class GenericFunctionInstance(GenericInstance, metaclass=InternMeta):
+    """
+    An instantiation of a generic function. Instances are interned, so instantiating a function with the same arguments
+    always results in the same object.
+
+    The signature is derived from the signature of the origin when it is first needed, and again whenever the origin
+    signature changed since.
+    """
+
+    _signature: FunctionSignature | None
+    _signature_stamp: tuple | None
+
     def __init__(self, origin: "IFunction", arguments: dict[IParameter, TypeProtocol]):
-        super().__init__(origin, arguments)
+        super().__init__(origin, MappingProxyType(dict(arguments)))
 
         self.runtime_type = GenericFunctionInstanceType(self)
-        self.signature = FunctionSignature(origin.name)
 
-        for parameter in self.origin.signature.positional_parameters:
-            self.signature.positional_parameters.append(Parameter(parameter.name, arguments.get(parameter.parameter_type, parameter.parameter_type)))
+        self._signature = self._signature_stamp = None
+
+    @property
+    def signature(self) -> FunctionSignature:
+        origin = self.origin.signature
+        stamp = self.origin.name, tuple((parameter, parameter.name, parameter.parameter_type) for parameter in origin.positional_parameters), origin.return_type
+        if self._signature is None or self._signature_stamp != stamp:
+            self._signature = self._build_signature()
+            self._signature_stamp = stamp
+        return self._signature
+
+    def _build_signature(self) -> FunctionSignature:
+        arguments = self.generic_arguments
+        origin = self.origin.signature
+        result = FunctionSignature(self.origin.name)
+
+        for parameter in origin.positional_parameters:
+            result.positional_parameters.append(Parameter(parameter.name, arguments.get(parameter.parameter_type, parameter.parameter_type)))
+
+        result.return_type = arguments.get(origin.return_type, origin.return_type)
+
+        return result
 
-        self.signature.return_type = arguments.get(self.origin.signature.return_type, self.origin.signature.return_type)
+    @staticmethod
+    def __intern_key__(origin: "IFunction", arguments: dict[IParameter, TypeProtocol]):
+        return origin, frozenset(arguments.items())
@@ -4,6 +4,7 @@ from miniz.core import TypeProtocol, ObjectProtocol, ScopeProtocol
 from miniz.generic import GenericInstance
 from miniz.interfaces.oop import IClass, IOOPMemberDefinition, IOOPReference
 from miniz.interfaces.signature import IParameter
+from utils import InternMeta
 
 if typing.TYPE_CHECKING:
     from miniz.concrete.oop import Class
@@ -38,25 +39,49 @@ class GenericClassInstanceMemberReference:
         return self.original.runtime_type
 
 
-class GenericClassInstance(GenericInstance[IClass], ScopeProtocol, IOOPReference):
+class GenericClassInstance(GenericInstance[IClass], ScopeProtocol, IOOPReference, metaclass=InternMeta):
+    """
+    An instantiation of a generic class. Instances are interned, so instantiating a class with the same arguments
+    always results in the same object.
+    """
+
     origin: "Class"
 
+    _member_references: dict[str, ObjectProtocol]
+    _member_references_version: int
+
     def __init__(self, origin: IClass, args: dict[IParameter, TypeProtocol]):
         super().__init__(origin, args)
         IOOPReference.__init__(self, origin)
 
+        self._member_references = {}
+        self._member_references_version = origin.members_version
+
         self.runtime_type = GenericClassInstanceType(self)
 
+    @staticmethod
+    def __intern_key__(origin: IClass, args: dict[IParameter, TypeProtocol]):
+        return origin, frozenset(args.items())
+
     def assignable_from(self, source: "TypeProtocol") -> bool:
         if not isinstance(source, GenericClassInstance):
             return source.assignable_to(self)
-        return source.origin == self.origin and self.generic_arguments == source.generic_arguments
+        return source is self
 
     def assignable_to(self, target: "TypeProtocol") -> bool:
         if not isinstance(target, GenericClassInstance):
             return target.assignable_from(self)
-        return target.origin == self.origin and self.generic_arguments == target.generic_arguments
+        return target is self
 
     def get_name(self, name: str):
-        result = self.origin.get_name(name)
-        return result.get_reference(owner=self)
+        version = self.origin.members_version
+        if self._member_references_version != version:
+            self._member_references.clear()
+            self._member_references_version = version
+        try:
+            return self._member_references[name]
+        except KeyError:
+            pass
+
+        result = self._member_references[name] = self.origin.get_name(name).get_reference(owner=self)
+        return result
@@ -3,6 +3,7 @@ from typing import TypeVar
 from miniz.core import TypeProtocol
 from miniz.ownership import Owned
 from miniz.vm.instruction import Instruction
+from utils import IndexedList
 
 
 _T = TypeVar("_T", bound="IExecutable")
@@ -18,7 +19,10 @@ class ITarget(Owned[_T]):
 
     @property
     def index(self):
-        return self.owner.locals.index(self)
+        locals = self.owner.locals
+        if isinstance(locals, IndexedList):
+            return locals.index_of(self)
+        return locals.index(self)
 
 
 class IExecutable:
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Callable
 
@@ -9,6 +9,19 @@ from miniz.interfaces.function import IFunction, IFunctionBody
 from miniz.interfaces.signature import IParameter
 from miniz.ownership import Owned
 from miniz.core import TypeProtocol
+from utils import VersionCounter
+
+
+dispatch_version = VersionCounter()
+"""
+Incremented whenever anything virtual or interface dispatch depends on changes. That is, whenever `type_version` is
+incremented or the members of any class change.
+"""
+
+type_version = VersionCounter(dispatch_version)
+"""
+Incremented whenever the base, the interfaces, the constructors or the implementations of any type change.
+"""
 
 
 class Binding(Enum):
@@ -110,6 +123,18 @@ class IMethodBody(IFunctionBody):
 class IMethod(IOOPMemberDefinition, IFunction):
     body: IMethodBody
 
+    def overrides(self, other: "IMethod") -> bool:
+        """
+        :return: Whether this method may replace the given method in a virtual table or implement it in an
+        interface table. That is, both methods have the same name and the same parameter types, excluding `this`.
+        """
+        if self.name != other.name:
+            return False
+        parameters, other_parameters = self.signature.parameters, other.signature.parameters
+        if len(parameters) != len(other_parameters):
+            return False
+        return all(p.parameter_type is q.parameter_type for p, q in zip(parameters[1:], other_parameters[1:]))
+
 
 class IProperty(IOOPMemberDefinition):
     property_type: TypeProtocol
@@ -178,6 +203,16 @@ class ImplementationInfo:
     The class that implements the specification. This class doesn't have to contain the actual implementation.
     """
 
+    itable: dict[IMethod, IMethod] = field(default_factory=dict)
+    """
+    Maps the methods of the specification to the methods which implement them.
+    """
+
+    itable_version: int = -1
+    """
+    The value of `dispatch_version` when `itable` was built.
+    """
+
 
 class OOPImplementable(IOOPDefinition):
     implementations: list[ImplementationInfo]
@@ -192,6 +227,8 @@ class OOPImplementable(IOOPDefinition):
         info = ImplementationInfo(self, implementation or implemented_type, implemented_type)
         self.implementations.append(info)
         self.implementations_mapping[implemented_type] = info
+        type_version.bump()
+        self.update_itable(info)
 
     def get_implementation(self, implemented_type: IClass) -> ImplementationInfo | None:
         try:
@@ -199,6 +236,43 @@ class OOPImplementable(IOOPDefinition):
         except KeyError:
             return None
 
+    def get_methods(self) -> list[IMethod]:
+        """
+        :return: The methods of this specification, including those of its bases.
+        """
+        result = []
+        pending = [self]
+        visited = set()
+        while pending:
+            specification = pending.pop()
+            if specification in visited:
+                continue
+            visited.add(specification)
+            result.extend(specification.methods)
+            pending.extend(getattr(specification, "bases", ()))
+        return result
+
+    def update_itable(self, info: ImplementationInfo) -> dict[IMethod, IMethod]:
+        """
+        Rebuilds the interface table of the given implementation if any type changed since it was last built.
+        Methods which are not implemented are missing from the table.
+        """
+        if info.itable_version == dispatch_version.value:
+            return info.itable
+
+        itable = {}
+        for method in self.get_methods():
+            if method.binding == Binding.Static:
+                continue
+            group = info.implementation.get_name(method.name)
+            for candidate in getattr(group, "overloads", ()):
+                if candidate.overrides(method):
+                    itable[method] = candidate
+                    break
+
+        info.itable, info.itable_version = itable, dispatch_version.value
+        return itable
+
     def is_implemented(self, implemented_type: IClass):
         return implemented_type in self.implementations_mapping
 
@@ -1,6 +1,16 @@
+from enum import Enum
+
 from miniz.interfaces.base import INamed
 from miniz.ownership import Owned
 from miniz.core import TypeProtocol
+from utils import IndexedList
+
+
+class ParameterKind(Enum):
+    Positional = "Positional"
+    Named = "Named"
+    VariadicPositional = "VariadicPositional"
+    VariadicNamed = "VariadicNamed"
 
 
 class IParameter(Owned["ISignature"], INamed):
@@ -8,26 +18,27 @@ class IParameter(Owned["ISignature"], INamed):
     local_index: int  # index of positional or named parameter in its respective list
     parameter_type: TypeProtocol
     has_default_value: bool
+    kind: ParameterKind | None = None  # set by the owning signature
 
     @property
     def is_positional(self):
-        return self in self.owner.positional_parameters
+        return self.kind is ParameterKind.Positional
 
     @property
     def is_named(self):
-        return self in self.owner.named_parameters
+        return self.kind is ParameterKind.Named
 
     @property
     def is_variadic(self):
-        return self.is_variadic_positional or self.is_variadic_named
+        return self.kind is ParameterKind.VariadicPositional or self.kind is ParameterKind.VariadicNamed
 
     @property
     def is_variadic_positional(self):
-        return self.owner.variadic_positional_parameter is self
+        return self.kind is ParameterKind.VariadicPositional
 
     @property
     def is_variadic_named(self):
-        return self.owner.variadic_named_parameter is self
+        return self.kind is ParameterKind.VariadicNamed
 
 
 class ISignature(INamed):
@@ -44,3 +55,26 @@ class ISignature(INamed):
         if self.variadic_named_parameter:
             result.append(self.variadic_named_parameter)
         return result
+
+    def index_of(self, parameter: IParameter) -> int:
+        """
+        :return: The index of the given parameter in `parameters`, without building that list.
+        :raises ValueError: if the parameter is not a parameter of this signature.
+        """
+        positional, named = self.positional_parameters, self.named_parameters
+        kind = parameter.kind if parameter.owner is self else None
+        if kind is ParameterKind.Positional:
+            return _index_of(positional, parameter)
+        if kind is ParameterKind.Named:
+            return len(positional) + _index_of(named, parameter)
+        if kind is ParameterKind.VariadicPositional:
+            return len(positional) + len(named)
+        if kind is ParameterKind.VariadicNamed:
+            return len(positional) + len(named) + (self.variadic_positional_parameter is not None)
+        raise ValueError(f"{parameter} is not a parameter of {self}")
+
+
+def _index_of(items: list, item) -> int:
+    if isinstance(items, IndexedList):
+        return items.index_of(item)
+    return items.index(item)
@@ -7,7 +7,7 @@ from miniz.template.signature import ParameterTemplate
 from miniz.concrete.signature import Parameter
 from miniz.interfaces.function import IFunction
 from miniz.type_system import TypeProtocol, Any, ObjectProtocol
-from utils import NotifyingList
+from utils import IndexedList
 
 _T = TypeVar("_T")
 _GenericT = TypeVar("_GenericT")
@@ -23,7 +23,7 @@ class FunctionTemplate(IFunction, IConstructor[Function]):
     signature: FunctionSignatureTemplate
     body: FunctionBody  # todo: GenericFunctionBody
 
-    _locals: NotifyingList[Local]
+    _locals: IndexedList[Local]
 
     def __init__(self, name: str = None, return_type: TypeProtocol | Parameter | ParameterTemplate = Any):
         super().__init__()
@@ -31,7 +31,7 @@ class FunctionTemplate(IFunction, IConstructor[Function]):
         self.signature = FunctionSignatureTemplate(name, return_type)
 
         self.body = FunctionBody(self)
-        self._locals = NotifyingList()
+        self._locals = IndexedList()
 
     @property
     def name(self):
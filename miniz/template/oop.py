@@ -7,7 +7,7 @@ from miniz.concrete.oop import Binding, Access, Method, Field, Property, Class,
 from miniz.concrete.signature import Parameter, Signature
 from miniz.interfaces.oop import IField, IMethod, IProperty, IOOPDefinition
 from miniz.type_system import TypeProtocol, ObjectProtocol, Any
-from utils import NotifyingList
+from utils import IndexedList, NotifyingList
 
 _T = TypeVar("_T")
 _GenericT = TypeVar("_GenericT")
@@ -150,7 +150,7 @@ class OOPObjectTemplate(IOOPDefinition, IConstructor["ConstructedClass | Constru
     _members: dict[str, MemberDefinition]
     _member_list: list[MemberDefinition]
 
-    _fields: NotifyingList[FieldTemplate | Field]
+    _fields: IndexedList[FieldTemplate | Field]
     _methods: NotifyingList[MethodTemplate | Method]
     _properties: NotifyingList[PropertyTemplate | Property]
     _constructors: NotifyingList[MethodTemplate | Method]
@@ -183,7 +183,7 @@ class OOPObjectTemplate(IOOPDefinition, IConstructor["ConstructedClass | Constru
             self.arguments = arguments
         self._cache = getattr(constructor, "_cache", {})
 
-        self._fields = NotifyingList()
+        self._fields = IndexedList()
         self._methods = NotifyingList()
         self._properties = NotifyingList()
         self._constructors = NotifyingList()
@@ -2,11 +2,11 @@ from functools import partial
 from typing import Callable, TypeVar, TypeAlias
 
 from miniz.template.template_construction import IConstructor, recursive_resolve
-from miniz.concrete.signature import Signature, Parameter
-from miniz.interfaces.signature import ISignature, IParameter
+from miniz.concrete.signature import Binder, Signature, Parameter
+from miniz.interfaces.signature import ISignature, IParameter, ParameterKind
 from miniz.core import ObjectProtocol, TypeProtocol
 from miniz.ownership import Owned
-from utils import NotifyingList, DependencyGraph
+from utils import IndexedList, DependencyGraph, event
 
 _T = TypeVar("_T")
 _GenericT = TypeVar("_GenericT")
@@ -50,23 +50,11 @@ class ParameterTemplate(IConstructor[Parameter], IParameter, Owned["GenericSigna
     def index(self):
         if self.owner is None:
             raise ValueError(f"Parameter currently doesn't have an index")
-        return self.owner.parameters.index(self)
+        return self.owner.index_of(self)
 
     @property
-    def is_positional(self):
-        return self in self.owner.positional_parameters
-
-    @property
-    def is_named(self):
-        return self in self.owner.named_parameters
-
-    @property
-    def is_variadic_positional(self):
-        return self.owner.variadic_positional_parameter is self
-
-    @property
-    def is_variadic_named(self):
-        return self.owner.variadic_named_parameter is self
+    def has_default_value(self):
+        return self.default_value is not None
 
     def construct(self, args: dict["IParameter", "ObjectProtocol | IParameter"], factory=None, generic_factory=None) -> "IParameter":
         # if self.type is an actual type, skip infer and validation
@@ -90,33 +78,69 @@ class SignatureTemplate(ISignature, IConstructor[Signature]):
 
     _parameters: dict[str, ParameterTemplate | Parameter]
 
-    _positional_parameters: NotifyingList[ParameterTemplate | Parameter]
-    _named_parameters: NotifyingList[ParameterTemplate | Parameter]
+    _positional_parameters: IndexedList[ParameterTemplate | Parameter]
+    _named_parameters: IndexedList[ParameterTemplate | Parameter]
 
     _variadic_positional_parameter: ParameterTemplate | Parameter | None
     _variadic_named_parameter: ParameterTemplate | Parameter | None
 
+    _binder: Binder | None
+    _parameters_view: tuple[ParameterTemplate | Parameter, ...] | None
+
     def __init__(self, name: str = None):
         ISignature.__init__(self)
         self.name = name
 
         self._parameters = {}
+        self._binder = None
+        self._parameters_view = None
 
-        self._positional_parameters = NotifyingList()
-        self._named_parameters = NotifyingList()
+        self._positional_parameters = IndexedList()
+        self._named_parameters = IndexedList()
 
-        def on_new_parameter(_, parameter: ParameterTemplate):
+        def on_new_parameter(ps, parameter: ParameterTemplate):
             if parameter.name in self._parameters:
                 raise ValueError(f"Parameter \'{parameter.name}\' already exists on {self}")
             self._parameters[parameter.name] = parameter
+            self._binder = self._parameters_view = None
+            self.parameters_changed()
             parameter.owner = self
+            if ps is self._positional_parameters:
+                parameter.kind = ParameterKind.Positional
+            elif ps is self._named_parameters:
+                parameter.kind = ParameterKind.Named
 
         def on_remove_parameter(ps, parameter: int | ParameterTemplate):
             if isinstance(parameter, int):
                 parameter = ps[parameter]
             assert isinstance(parameter, (Parameter, ParameterTemplate))
             del self._parameters[parameter.name]
+            self._binder = self._parameters_view = None
+            self.parameters_changed()
             parameter.owner = None
+            parameter.kind = None
+
+        def on_extend_parameters(ps, parameters):
+            if iter(parameters) is parameters:
+                raise TypeError("Parameters must be added from a collection, not from an iterator")
+            for parameter in parameters:
+                on_new_parameter(ps, parameter)
+
+        def on_set_parameter(ps, key: int | slice, value):
+            if isinstance(key, slice):
+                if iter(value) is value:
+                    raise TypeError("Parameters must be added from a collection, not from an iterator")
+                old, new = ps[key], value
+            else:
+                old, new = [ps[key]], [value]
+            for parameter in old:
+                on_remove_parameter(ps, parameter)
+            for parameter in new:
+                on_new_parameter(ps, parameter)
+
+        def on_delete_parameter(ps, key: int | slice):
+            for parameter in ps[key] if isinstance(key, slice) else [ps[key]]:
+                on_remove_parameter(ps, parameter)
 
         self._positional_parameters.append += on_new_parameter
         self._named_parameters.append += on_new_parameter
@@ -126,19 +150,40 @@ class SignatureTemplate(ISignature, IConstructor[Signature]):
         self._positional_parameters.remove += on_remove_parameter
         self._named_parameters.remove += on_remove_parameter
 
+        self._positional_parameters.extend += on_extend_parameters
+        self._named_parameters.extend += on_extend_parameters
+        self._positional_parameters.__setitem__ += on_set_parameter
+        self._named_parameters.__setitem__ += on_set_parameter
+        self._positional_parameters.__delitem__ += on_delete_parameter
+        self._named_parameters.__delitem__ += on_delete_parameter
+
         self.__on_new_parameter = on_new_parameter
         self.__on_remove_parameter = on_remove_parameter
 
         self._variadic_positional_parameter = self._variadic_named_parameter = None
 
     @property
-    def parameters(self) -> list[Parameter | ParameterTemplate]:
-        result = [*self.positional_parameters, *self.named_parameters]
-        if self.variadic_positional_parameter:
-            result.append(self.variadic_positional_parameter)
-        if self.variadic_named_parameter:
-            result.append(self.variadic_named_parameter)
-        return result
+    def parameters(self) -> tuple[Parameter | ParameterTemplate, ...]:
+        if self._parameters_view is None:
+            result = [*self._positional_parameters, *self._named_parameters]
+            if self._variadic_positional_parameter is not None:
+                result.append(self._variadic_positional_parameter)
+            if self._variadic_named_parameter is not None:
+                result.append(self._variadic_named_parameter)
+            self._parameters_view = tuple(result)
+        return self._parameters_view
+
+    @event
+    def parameters_changed(self):
+        """
+        Called whenever parameters are added to or removed from this signature.
+        """
+
+    @property
+    def binder(self) -> Binder:
+        if self._binder is None:
+            self._binder = Binder(self)
+        return self._binder
 
     @property
     def positional_parameters(self):
@@ -163,6 +208,7 @@ class SignatureTemplate(ISignature, IConstructor[Signature]):
             if self.variadic_positional_parameter is not None:
                 self.variadic_positional_parameter = None
             self.__on_new_parameter(None, value)
+            value.kind = ParameterKind.VariadicPositional
             self._variadic_positional_parameter = value
 
     @property
@@ -180,12 +226,11 @@ class SignatureTemplate(ISignature, IConstructor[Signature]):
             if self.variadic_named_parameter is not None:
                 self.variadic_named_parameter = None
             self.__on_new_parameter(None, value)
+            value.kind = ParameterKind.VariadicNamed
             self._variadic_named_parameter = value
 
     def _get_build_order(self, args: GenericArguments):
-        all_parameters = list(filter(bool, [*self.positional_parameters, *self.named_parameters, self.variadic_positional_parameter, self.variadic_named_parameter]))
-
-        return DependencyGraph.from_list(all_parameters, partial(get_parameter_dependencies, args))
+        return DependencyGraph.from_list(list(self.parameters), partial(get_parameter_dependencies, args))
 
     def construct(
             self,
@@ -197,15 +242,17 @@ class SignatureTemplate(ISignature, IConstructor[Signature]):
 
         build_order = self._get_build_order(args)
 
-        def recursive_infer(p: ParameterTemplate):
-            if p in args and p.parameter_type not in args:
+        def infer(p: ParameterTemplate):
+            # each inferred type may be the value of the next parameter template in the chain
+            while p in args and p.parameter_type not in args:
                 args[p.parameter_type] = args[p].runtime_type
-                if isinstance(p.parameter_type, ParameterTemplate):
-                    recursive_infer(p.parameter_type)
+                if not isinstance(p.parameter_type, ParameterTemplate):
+                    break
+                p = p.parameter_type
 
         for parameter in args.copy():
             if isinstance(parameter, ParameterTemplate):
-                recursive_infer(parameter)
+                infer(parameter)
 
         for parameters in build_order:
             for parameter in parameters:
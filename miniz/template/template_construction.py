@@ -2,20 +2,21 @@ from typing import TypeVar, Generic, Callable
 
 from miniz.core import ObjectProtocol
 from miniz.interfaces.signature import IParameter
+from miniz.template.unification import Unifier
 
 _T = TypeVar("_T")
 _U = TypeVar("_U")
 
 
 def recursive_resolve(args: dict[_T, ObjectProtocol | _T], start: _T) -> ObjectProtocol | _T:
-    try:
-        step = args[start]
-    except KeyError:
-        return start
-    else:
-        if step is start:
-            raise ValueError
-        return recursive_resolve(args, step)
+    """
+    Follows the chain of `args` from `start` to its end. Entries along the chain are updated to point to the end of
+    the chain, so the next lookup of any of them takes a single step. Note that this modifies `args`, so it must not be
+    a mapping which is shared with other objects.
+
+    :raises ValueError: if the chain is cyclic.
+    """
+    return Unifier.over(args, trail=False).find(start)
 
 
 class IConstructor(Generic[_T]):
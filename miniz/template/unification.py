@@ -0,0 +1,247 @@
+"""
+This module contains the unification engine used to infer generic arguments.
+
+Variables are kept in a union-find structure. Each variable points either to another variable or to the term it is
+bound to, and `find` compresses the paths it walks. Every change is recorded on a trail, so a failed attempt can be
+undone with `undo` without copying the substitution.
+"""
+
+from typing import Callable, Iterable
+
+from miniz.core import TypeProtocol
+from miniz.generic import GenericParameter
+
+
+_UNBOUND = object()
+
+
+def decompose(type: TypeProtocol) -> tuple[object, tuple[TypeProtocol, ...]]:
+    """
+    :return: The head constructor of the given type and its type arguments. The head of a generic parameter is `None`
+    and the head of a type which is not constructed from other types is the type itself.
+    """
+    from miniz.generic.oop import GenericClassInstance
+    from miniz.type_system import Array, FunctionType, Nullable
+
+    match type:
+        case GenericParameter():
+            return None, ()
+        case GenericClassInstance():
+            return type.origin, tuple(type.generic_arguments.values())
+        case Nullable():
+            return Nullable, (type.type,)
+        case Array():
+            return Array, (type.element_type,)
+        case FunctionType():
+            return FunctionType, (*type.parameter_types, type.return_type)
+    return type, ()
+
+
+def compose(head: object, args: tuple[TypeProtocol, ...]) -> TypeProtocol:
+    """
+    The inverse of `decompose` for constructed types.
+    """
+    from miniz.generic.oop import GenericClassInstance
+    from miniz.type_system import Array, FunctionType, Nullable
+
+    if head is Nullable:
+        return Nullable(args[0])
+    if head is Array:
+        return Array(args[0])
+    if head is FunctionType:
+        return FunctionType(args[:-1], args[-1])
+    return GenericClassInstance(head, dict(zip(head.generic_parameters, args)))
+
+
+class Unifier:
+    """
+    A substitution of variables which may be extended by unifying terms.
+    """
+
+    is_variable: Callable[[object], bool]
+
+    _parent: dict[object, object]
+    _trail: list[tuple[object, object]] | None  # `None` if changes are not recorded
+
+    def __init__(self, variables: Iterable[object] | Callable[[object], bool] = None):
+        """
+        :param variables: Either the variables, or a predicate which tells whether a term is a variable. By default,
+        all generic parameters are variables.
+        """
+        if variables is None:
+            self.is_variable = lambda term: isinstance(term, GenericParameter)
+        elif callable(variables):
+            self.is_variable = variables
+        else:
+            self.is_variable = set(variables).__contains__
+
+        self._parent = {}
+        self._trail = []
+
+    @classmethod
+    def from_mapping(cls, mapping: dict, variables: Iterable[object] | Callable[[object], bool] = None) -> "Unifier":
+        """
+        Creates a unifier in which each key of `mapping` is bound to its value. If `variables` is not given, the keys
+        of the mapping are the variables.
+        """
+        result = cls(variables if variables is not None else mapping.keys())
+        for variable, value in mapping.items():
+            result.bind(variable, value)
+        return result
+
+    @classmethod
+    def over(cls, mapping: dict, variables: Iterable[object] | Callable[[object], bool] = None, *, trail: bool = True) -> "Unifier":
+        """
+        Creates a unifier whose substitution is `mapping` itself, rather than a copy of it. Bindings and path
+        compressions are made directly in the mapping. If `variables` is not given, the keys of the mapping are the
+        variables.
+
+        :param trail: Whether changes are recorded so they may be undone. A unifier which doesn't record its changes
+        can't `unify` or `undo`, and is meant for looking up terms in an existing substitution.
+        """
+        result = cls(variables if variables is not None else mapping.__contains__)
+        result._parent = mapping
+        if not trail:
+            result._trail = None
+        return result
+
+    def find(self, term: object) -> object:
+        """
+        :return: The representative of the given term. This is the term bound to it if there is one, or the last
+        variable of its chain otherwise.
+
+        :raises ValueError: if the chain of the term is cyclic. This may only happen if the substitution was not built
+        by this unifier (see `over`).
+        """
+        parent = self._parent
+        root = term
+        steps = len(parent)
+        while root in parent:
+            root = parent[root]
+            steps -= 1
+            if steps < 0:
+                raise ValueError(f"Cyclic substitution chain starting at {term}")
+
+        trail = self._trail
+        while term in parent and parent[term] is not root:
+            if trail is not None:
+                trail.append((term, parent[term]))
+            parent[term], term = root, parent[term]
+
+        return root
+
+    def resolve(self, term: object) -> object:
+        """
+        :return: The given term with all bound variables replaced, including those nested in constructed types.
+        """
+        term = self.find(term)
+        head, args = decompose(term) if isinstance(term, TypeProtocol) else (term, ())
+        if not args:
+            return term
+        resolved = tuple(self.resolve(arg) for arg in args)
+        if all(a is b for a, b in zip(args, resolved)):
+            return term
+        return compose(head, resolved)
+
+    def is_bound(self, variable: object) -> bool:
+        return variable in self._parent
+
+    def has_variables(self, term: object) -> bool:
+        """
+        :return: Whether the given term contains a variable which is not bound.
+        """
+        pending = [term]
+        while pending:
+            term = self.find(pending.pop())
+            if self.is_variable(term):
+                return True
+            if isinstance(term, TypeProtocol):
+                pending.extend(decompose(term)[1])
+        return False
+
+    def bind(self, variable: object, term: object) -> bool:
+        """
+        Binds the representative of `variable` to `term`.
+
+        :return: `False` if the binding would make a term contain itself (occurs check) or if the variable is already
+        bound to a different term.
+        """
+        variable, term = self.find(variable), self.find(term)
+        if variable is term:
+            return True
+        if not self.is_variable(variable):
+            if self.is_variable(term):
+                variable, term = term, variable
+            else:
+                return False
+        if self._occurs(variable, term):
+            return False
+        if self._trail is not None:
+            self._trail.append((variable, _UNBOUND))
+        self._parent[variable] = term
+        return True
+
+    def unify(self, left: object, right: object) -> bool:
+        """
+        Makes the two terms equal by binding variables in both of them. If unification fails, the substitution is
+        left unchanged.
+        """
+        mark = self.mark()
+        pending = [(left, right)]
+        while pending:
+            left, right = pending.pop()
+            left, right = self.find(left), self.find(right)
+            if left is right:
+                continue
+            if self.is_variable(left) or self.is_variable(right):
+                if self.bind(left, right):
+                    continue
+                break
+            if not (isinstance(left, TypeProtocol) and isinstance(right, TypeProtocol)):
+                break
+            head, args = decompose(left)
+            other_head, other_args = decompose(right)
+            if head is None or head is not other_head or len(args) != len(other_args):
+                break
+            pending.extend(zip(args, other_args))
+        else:
+            return True
+
+        self.undo(mark)
+        return False
+
+    def mark(self) -> int:
+        """
+        :return: A point on the trail which may be passed to `undo`.
+        """
+        if self._trail is None:
+            raise ValueError(f"The changes of this unifier are not recorded")
+        return len(self._trail)
+
+    def undo(self, mark: int):
+        """
+        Reverts all changes made since `mark` was taken, including path compressions.
+        """
+        trail, parent = self._trail, self._parent
+        while len(trail) > mark:
+            term, previous = trail.pop()
+            if previous is _UNBOUND:
+                del parent[term]
+            else:
+                parent[term] = previous
+
+    def bindings(self) -> dict[object, object]:
+        """
+        :return: A mapping of each bound variable to its resolved term.
+        """
+        return {variable: self.resolve(variable) for variable in self._parent if self.is_variable(variable)}
+
+    def _occurs(self, variable: object, term: object) -> bool:
+        pending = [term]
+        while pending:
+            term = self.find(pending.pop())
+            if term is variable:
+                return True
+            if isinstance(term, TypeProtocol):
+                pending.extend(decompose(term)[1])
+        return False
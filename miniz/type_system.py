@@ -4,14 +4,91 @@ This module defines the core of the Z# type system. This may be used by both the
 Objects defined in this module should not be exposed to the Z# environment.
 """
 
+import heapq
+import itertools
+import weakref
+from collections import OrderedDict
+from typing import Iterable
+
 from miniz.concrete.oop import Class, Method
 from miniz.core import TypeProtocol, ObjectProtocol, ScopeProtocol
 from miniz.interfaces.base import INamed
-from miniz.interfaces.oop import Binding, IOOPDefinition
+from miniz.interfaces.oop import Binding, IOOPDefinition, type_version
 from miniz.vm import instructions as vm
+from utils import InternMeta
+
+
+class AssignabilityCache:
+    """
+    Caches the results of `assignable_to` by the identities of the source and target types.
+
+    The whole cache is dropped when `type_version` changes. When the cache is full, the least recently used result is dropped.
+    """
+
+    max_size: int
+    hits: int
+    misses: int
+
+    _results: OrderedDict[tuple[TypeProtocol, TypeProtocol], bool]
+    _version: int
+
+    def __init__(self, max_size: int = 65536):
+        self.max_size = max_size
+        self.hits = self.misses = 0
+
+        self._results = OrderedDict()
+        self._version = type_version.value
+
+    def assignable_to(self, source: TypeProtocol, target: TypeProtocol) -> bool:
+        if self._version != type_version.value:
+            self._results.clear()
+            self._version = type_version.value
+
+        key = source, target
+        try:
+            result = self._results[key]
+        except KeyError:
+            pass
+        except TypeError:  # unhashable type
+            return _assignable_to(source, target)
+        else:
+            self.hits += 1
+            try:
+                self._results.move_to_end(key)
+            except KeyError:  # evicted by another thread
+                pass
+            return result
+
+        self.misses += 1
+        result = self._results[key] = _assignable_to(source, target)
+        if len(self._results) > self.max_size:
+            try:
+                self._results.popitem(last=False)
+            except KeyError:  # emptied by another thread
+                pass
+        return result
+
+    def clear(self):
+        self._results.clear()
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._results)
+
+
+assignability_cache = AssignabilityCache()
 
 
 def assignable_to(source: TypeProtocol, target: TypeProtocol) -> bool:
+    return assignability_cache.assignable_to(source, target)
+
+
+def _assignable_to(source: TypeProtocol, target: TypeProtocol) -> bool:
+    # the rules of union and intersection types decide on their own, since other types don't know about them
+    if isinstance(source, (UnionType, IntersectionType)):
+        return source.assignable_to(target)
+    if isinstance(target, (UnionType, IntersectionType)):
+        return target.assignable_from(source)
     return source.assignable_to(target) and target.assignable_from(source)
 
 
@@ -28,6 +105,23 @@ def is_type(__object) -> bool:
         return True
 
 
+def type_of(__object) -> TypeProtocol:
+    """
+    Returns the runtime type of the given value. Unlike `runtime_type`, this also works for unboxed primitive values.
+
+    Note that the width of an unboxed integer is not known at runtime, so integers are always reported as `i64`.
+    Constants of other primitive types must be loaded with `LoadConstant`, which carries the type.
+    """
+    match __object:
+        case bool():
+            raise TypeError(f"Python booleans are not Z# values, use Boolean.TrueInstance or Boolean.FalseInstance")
+        case int():
+            return I64
+        case float():
+            return F64
+    return __object.runtime_type
+
+
 class _Type(Class):
     def __init__(self):
         IOOPDefinition.runtime_type_constructor = lambda _: _
@@ -215,10 +309,14 @@ Any = _Any()
 del _Any
 
 
-class Nullable(TypeProtocol):
+class Nullable(TypeProtocol, metaclass=InternMeta):
     def __init__(self, type: TypeProtocol):
         self.type = type
 
+    @staticmethod
+    def __intern_key__(type: TypeProtocol):
+        return type
+
     def assignable_to(self, target: "TypeProtocol") -> bool:
         return isinstance(target, Nullable) and target.type.assignable_to(self.type)
 
@@ -262,6 +360,264 @@ Null = _Null()
 del _Null
 
 
+class PrimitiveType(_TypeBase):
+    """
+    A primitive numeric type. Values of primitive types are not `ObjectProtocol` objects, but plain Python
+    `int` or `float` objects.
+    """
+
+    native: type
+    bits: int
+
+    def __init__(self, name: str, native: type, bits: int):
+        super().__init__(name)
+
+        self.native = native
+        self.bits = bits
+
+    @property
+    def is_integer(self):
+        return self.native is int
+
+    def is_instance(self, __object) -> bool:
+        if type(__object) is not self.native:
+            return False
+        if self.is_integer:
+            return -(1 << self.bits - 1) <= __object < (1 << self.bits - 1)
+        return True
+
+    def assignable_to(self, target: "TypeProtocol") -> bool:
+        return target.assignable_from(self)
+
+    def assignable_from(self, source: "TypeProtocol") -> bool:
+        return source is self
+
+    def __repr__(self):
+        return self.name
+
+
+I32 = PrimitiveType("i32", int, 32)
+I64 = PrimitiveType("i64", int, 64)
+F64 = PrimitiveType("f64", float, 64)
+
+
+class Array(TypeProtocol, metaclass=InternMeta):
+    """
+    The type of arrays whose elements are of type `element_type`.
+
+    Arrays of primitive types store their elements unboxed in a contiguous `array.array` buffer (see `typecode`).
+    Arrays of any other type store their elements in a list.
+    """
+
+    _TYPECODES = {
+        I32: 'i',
+        I64: 'q',
+        F64: 'd',
+    }
+
+    element_type: TypeProtocol
+
+    def __init__(self, element_type: TypeProtocol):
+        self.element_type = element_type
+        self.runtime_type = Type
+
+    @staticmethod
+    def __intern_key__(element_type: TypeProtocol):
+        return element_type
+
+    @property
+    def typecode(self) -> str | None:
+        """
+        The `array` module typecode of the element buffer, or `None` if the elements are stored in a list.
+        """
+        return self._TYPECODES.get(self.element_type)
+
+    @property
+    def default_element(self):
+        if isinstance(self.element_type, PrimitiveType):
+            return self.element_type.native()
+        return None
+
+    def assignable_to(self, target: "TypeProtocol") -> bool:
+        return isinstance(target, Array) and target.element_type is self.element_type
+
+    def assignable_from(self, source: "TypeProtocol") -> bool:
+        return isinstance(source, Array) and source.element_type is self.element_type
+
+    def __repr__(self):
+        return repr(self.element_type) + "[]"
+
+
+class FunctionType(TypeProtocol, metaclass=InternMeta):
+    """
+    The type of functions which accept arguments of the types `parameter_types` and return a value of type `return_type`.
+    """
+
+    parameter_types: tuple[TypeProtocol, ...]
+    return_type: TypeProtocol
+
+    def __init__(self, parameter_types: tuple[TypeProtocol, ...] | list[TypeProtocol], return_type: TypeProtocol):
+        self.parameter_types = tuple(parameter_types)
+        self.return_type = return_type
+        self.runtime_type = Type
+
+    @staticmethod
+    def __intern_key__(parameter_types: tuple[TypeProtocol, ...] | list[TypeProtocol], return_type: TypeProtocol):
+        return tuple(parameter_types), return_type
+
+    def assignable_to(self, target: "TypeProtocol") -> bool:
+        return target is self
+
+    def assignable_from(self, source: "TypeProtocol") -> bool:
+        return source is self
+
+    def __repr__(self):
+        return f"fun({', '.join(map(repr, self.parameter_types))}): {self.return_type!r}"
+
+
+_type_ids: "weakref.WeakKeyDictionary[TypeProtocol, int]" = weakref.WeakKeyDictionary()
+_next_type_id = itertools.count()
+_free_type_ids: list[int] = []  # a heap of the IDs of collected types
+
+
+def type_id(type: TypeProtocol) -> int:
+    """
+    :return: A small integer which identifies the given type. The ID of a collected type is given to the next new
+    type, smallest first, so the IDs in use stay dense.
+    """
+    try:
+        return _type_ids[type]
+    except KeyError:
+        pass
+    try:
+        result = heapq.heappop(_free_type_ids)
+    except IndexError:
+        result = next(_next_type_id)
+    _type_ids[type] = result
+    weakref.finalize(type, heapq.heappush, _free_type_ids, result)
+    return result
+
+
+def _normalize(kind: type, types: Iterable[TypeProtocol]) -> tuple[TypeProtocol, ...]:
+    members = {}
+    for item in types:
+        for member in (item.members if isinstance(item, kind) else (item,)):
+            members[type_id(member)] = member
+    return tuple(members[key] for key in sorted(members))
+
+
+def _mask(types: Iterable[TypeProtocol]) -> int:
+    mask = 0
+    for item in types:
+        mask |= 1 << type_id(item)
+    return mask
+
+
+class _CompositeType(TypeProtocol):
+    members: tuple[TypeProtocol, ...]
+    """
+    The member types, ordered by their `type_id`.
+    """
+
+    mask: int
+    """
+    A bit set of the `type_id` of the members.
+    """
+
+    def __init__(self, members: tuple[TypeProtocol, ...]):
+        self.members = members
+        self.mask = _mask(members)
+        self.runtime_type = Type
+
+    @staticmethod
+    def __intern_key__(members: tuple[TypeProtocol, ...]):
+        return members
+
+    def is_subset_of(self, other: "_CompositeType") -> bool:
+        return not self.mask & ~other.mask
+
+    def __contains__(self, item: TypeProtocol):
+        return bool(self.mask >> type_id(item) & 1)
+
+    def __iter__(self):
+        return iter(self.members)
+
+    def __len__(self):
+        return len(self.members)
+
+
+class UnionType(_CompositeType, metaclass=InternMeta):
+    """
+    The type of values which are of any of the member types. Use `union` to create union types.
+    """
+
+    def assignable_to(self, target: "TypeProtocol") -> bool:
+        if isinstance(target, UnionType) and self.is_subset_of(target):
+            return True
+        return all(assignable_to(member, target) for member in self.members)
+
+    def assignable_from(self, source: "TypeProtocol") -> bool:
+        if isinstance(source, UnionType):
+            return source.is_subset_of(self) or all(assignable_to(member, self) for member in source.members)
+        if source in self:
+            return True
+        return any(assignable_to(source, member) for member in self.members)
+
+    def __repr__(self):
+        return " | ".join(map(repr, self.members))
+
+
+class IntersectionType(_CompositeType, metaclass=InternMeta):
+    """
+    The type of values which are of all the member types. Use `intersection` to create intersection types.
+    """
+
+    def assignable_to(self, target: "TypeProtocol") -> bool:
+        if isinstance(target, IntersectionType):
+            return target.is_subset_of(self) or all(assignable_to(self, member) for member in target.members)
+        if target in self:
+            return True
+        return any(assignable_to(member, target) for member in self.members)
+
+    def assignable_from(self, source: "TypeProtocol") -> bool:
+        if isinstance(source, IntersectionType) and self.is_subset_of(source):
+            return True
+        return all(assignable_to(source, member) for member in self.members)
+
+    def __repr__(self):
+        return " & ".join(map(repr, self.members))
+
+
+def union(*types: TypeProtocol) -> TypeProtocol:
+    """
+    Creates the union of the given types. Nested unions are flattened and duplicates are removed, so equal
+    unions are the same object. The union of a single type is the type itself.
+
+    :raises ValueError: if no types are given.
+    """
+    members = _normalize(UnionType, types)
+    if not members:
+        raise ValueError(f"A union must have at least 1 type")
+    if len(members) == 1:
+        return members[0]
+    return UnionType(members)
+
+
+def intersection(*types: TypeProtocol) -> TypeProtocol:
+    """
+    Creates the intersection of the given types. Nested intersections are flattened and duplicates are removed,
+    so equal intersections are the same object. The intersection of a single type is the type itself.
+
+    :raises ValueError: if no types are given.
+    """
+    members = _normalize(IntersectionType, types)
+    if not members:
+        raise ValueError(f"An intersection must have at least 1 type")
+    if len(members) == 1:
+        return members[0]
+    return IntersectionType(members)
+
+
 class _ObjectType(Class):
     def __init__(self):
         super().__init__("Object")
@@ -324,7 +680,14 @@ if __name__ == '__main__':
     print("Null:", Null)
     print("Null.NullInstance:", Null.NullInstance)
 
-    print("Nullable(Boolean):", Nullable(Boolean))
+    print("i32, i64, f64:", I32, I64, F64)
+    print("type_of(5):", type_of(5))
+    print("Array(I32):", Array(I32), Array(I32).typecode)
+
+    print("Nullable(Boolean):", Nullable(Boolean), Nullable(Boolean) is Nullable(Boolean))
+    print("FunctionType([I32], Boolean):", FunctionType([I32], Boolean))
+    print("union(I32, Boolean, I32):", union(I32, Boolean, I32), union(I32, Boolean) is union(Boolean, I32))
+    print("i32 | bool <- i32 ::", assignable_to(I32, union(I32, Boolean)))
     print("bool? <- bool ::", assignable_to(Boolean, Nullable(Boolean)))
     print("bool <- bool? ::", assignable_from(Boolean, Nullable(Boolean)))
 
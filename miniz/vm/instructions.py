@@ -1,4 +1,5 @@
-from dataclasses import dataclass
+import typing
+from dataclasses import dataclass, field
 from typing import Callable
 
 from miniz.concrete.function import Function, Local
@@ -9,6 +10,9 @@ from miniz.concrete.signature import Parameter
 from miniz.core import ObjectProtocol
 from miniz.vm.instruction import Instruction
 
+if typing.TYPE_CHECKING:
+    from miniz.type_system import Array, PrimitiveType
+
 _cfg = {
     "slots": True,
     "eq": False
@@ -23,6 +27,88 @@ class IJumpInstruction:
     target: Instruction
 
 
+class INumericInstruction:
+    """
+    Numeric instructions operate on unboxed values of the primitive type `type`.
+    """
+
+    type: "PrimitiveType"
+
+
+@dataclass(**_cfg)
+class _UnaryNumericInstruction(Instruction, INumericInstruction):
+    type: "PrimitiveType"
+
+    operands = ["type"]
+
+
+@dataclass(**_cfg)
+class _BinaryNumericInstruction(Instruction, INumericInstruction):
+    """
+    Pops the right operand and then the left operand, and pushes the result.
+    """
+    type: "PrimitiveType"
+
+    operands = ["type"]
+
+
+@dataclass(**_cfg)
+class Add(_BinaryNumericInstruction):
+    op_code = "add"
+
+
+class ArrayCopy(Instruction):
+    """
+    Copies `count` elements from `source[source_start:]` to `destination[destination_start:]`.
+
+    Pops `count`, `destination_start`, `destination`, `source_start` and `source` (in this order).
+    """
+
+    op_code = "array-copy"
+
+
+class ArrayFill(Instruction):
+    """
+    Sets `count` elements of `array` starting at `start` to `value`.
+
+    Pops `value`, `count`, `start` and `array` (in this order).
+    """
+
+    op_code = "array-fill"
+
+
+class ArrayLength(Instruction):
+    op_code = "array-length"
+
+
+class ArraySlice(Instruction):
+    """
+    Pushes a new array with a copy of the elements of `array[start:stop]`.
+
+    Pops `stop`, `start` and `array` (in this order).
+    """
+
+    op_code = "array-slice"
+
+
+@dataclass(**_cfg)
+class CallInterface(Instruction, ICallInstruction):
+    """
+    Calls the implementation of the interface method `method` for the runtime type of the receiver, which is the first argument.
+
+    The implementation found for the last receiver type is cached in the instruction.
+    """
+    method: IMethod
+    cache: tuple[object, int, IMethod] | None = field(default=None, init=False, repr=False)
+
+    op_code = "call-interface"
+    operands = ["method"]
+
+    @property
+    def callee(self):
+        return self.method
+
+
 @dataclass(**_cfg)
 class CallNative(Instruction, ICallInstruction):
     callee: Callable
@@ -44,6 +130,46 @@ class Call(Instruction, ICallInstruction):
     operands = ["callee"]
 
 
+@dataclass(**_cfg)
+class CallVirtual(Instruction, ICallInstruction):
+    """
+    Calls the implementation of the virtual method `method` for the runtime type of the receiver, which is the first argument.
+    """
+    method: IMethod
+
+    op_code = "call-virtual"
+    operands = ["method"]
+
+    @property
+    def callee(self):
+        return self.method
+
+
+@dataclass(**_cfg)
+class Convert(Instruction):
+    """
+    Converts the unboxed value on the top of the stack from the primitive type `source` to the primitive type `target`.
+    Integers are wrapped to the width of the target type and floats are truncated towards zero. NaN converts to 0 and
+    infinities to the smallest or largest value of an integer target type.
+    """
+    source: "PrimitiveType"
+    target: "PrimitiveType"
+
+    op_code = "convert"
+    operands = ["source", "target"]
+
+
+@dataclass(**_cfg)
+class CreateArray(Instruction):
+    """
+    Pops a length and pushes a new array of that length, filled with the default value of the element type.
+    """
+    type: "Array"
+
+    op_code = "create-array"
+    operands = ["type"]
+
+
 @dataclass(**_cfg)
 class CreateInstance(Instruction, ICallInstruction):
     constructor: IMethod
@@ -60,10 +186,34 @@ class CreateInstance(Instruction, ICallInstruction):
         self.constructor = value
 
 
+@dataclass(**_cfg)
+class Divide(_BinaryNumericInstruction):
+    """
+    Integer division truncates towards zero.
+    """
+
+    op_code = "divide"
+
+
 class DuplicateTop(Instruction):
     op_code = "duplicate-top"
 
 
+@dataclass(**_cfg)
+class Equal(_BinaryNumericInstruction):
+    op_code = "equal"
+
+
+@dataclass(**_cfg)
+class GreaterThan(_BinaryNumericInstruction):
+    op_code = "greater-than"
+
+
+@dataclass(**_cfg)
+class GreaterThanOrEqual(_BinaryNumericInstruction):
+    op_code = "greater-than-or-equal"
+
+
 @dataclass(**_cfg)
 class Jump(Instruction, IJumpInstruction):
     target: Instruction
@@ -88,6 +238,16 @@ class JumpIfTrue(Instruction, IJumpInstruction):
     operands = ["target"]
 
 
+@dataclass(**_cfg)
+class LessThan(_BinaryNumericInstruction):
+    op_code = "less-than"
+
+
+@dataclass(**_cfg)
+class LessThanOrEqual(_BinaryNumericInstruction):
+    op_code = "less-than-or-equal"
+
+
 @dataclass(**_cfg)
 class LoadArgument(Instruction):
     parameter: Parameter | ParameterTemplate | int
@@ -96,6 +256,30 @@ class LoadArgument(Instruction):
     operands = ["parameter"]
 
 
+@dataclass(**_cfg)
+class LoadConstant(Instruction):
+    """
+    Pushes the unboxed value `value` of the primitive type `type`.
+    """
+    value: int | float
+    type: "PrimitiveType"
+
+    op_code = "load-constant"
+    operands = ["value", "type"]
+
+    def __post_init__(self):
+        if not self.type.is_instance(self.value):
+            raise ValueError(f"{self.value!r} is not a valid {self.type} value")
+
+
+class LoadElement(Instruction):
+    """
+    Pops an index and an array, and pushes the element at that index.
+    """
+
+    op_code = "load-element"
+
+
 @dataclass(**_cfg)
 class LoadField(Instruction):
     field: IField
@@ -140,10 +324,25 @@ class LoadObject(Instruction):
         return cls(Unit.UnitInstance)
 
 
+@dataclass(**_cfg)
+class Multiply(_BinaryNumericInstruction):
+    op_code = "multiply"
+
+
+@dataclass(**_cfg)
+class Negate(_UnaryNumericInstruction):
+    op_code = "negate"
+
+
 class NoOperation(Instruction):
     op_code = "nop"
 
 
+@dataclass(**_cfg)
+class NotEqual(_BinaryNumericInstruction):
+    op_code = "not-equal"
+
+
 class Pop(Instruction):
     """
     The `pop` instruction
@@ -152,6 +351,15 @@ class Pop(Instruction):
     op_code = "pop"
 
 
+@dataclass(**_cfg)
+class Remainder(_BinaryNumericInstruction):
+    """
+    The remainder of an integer division has the sign of the left operand.
+    """
+
+    op_code = "remainder"
+
+
 class Return(Instruction):
     """
     The `return` instruction.
@@ -168,6 +376,14 @@ class SetArgument(Instruction):
     operands = ["parameter"]
 
 
+class SetElement(Instruction):
+    """
+    Pops a value, an index and an array, and sets the element at that index to the value.
+    """
+
+    op_code = "set-element"
+
+
 @dataclass(**_cfg)
 class SetField(Instruction):
     field: IField
@@ -184,6 +400,11 @@ class SetLocal(Instruction):
     operands = ["local"]
 
 
+@dataclass(**_cfg)
+class Subtract(_BinaryNumericInstruction):
+    op_code = "subtract"
+
+
 class TypeOf(Instruction):
     """
     Why is this an instruction?
@@ -0,0 +1,314 @@
+"""
+This module contains the native function registry, which binds Python callables to Z# signatures so they may be
+called by the `call-native` instruction.
+
+Each native gets a thunk generated when it is registered. The thunk pops exactly the native's arguments from the
+operand stack, converts each of them to a Python value with a converter chosen by the parameter's type, calls the
+native and boxes the result according to the return type. No introspection happens when the native is called.
+"""
+
+import inspect
+import keyword
+from types import ModuleType
+from typing import Callable, Iterable
+
+from miniz.concrete.function_signature import FunctionSignature
+from miniz.concrete.signature import Parameter
+from miniz.core import ObjectProtocol, TypeProtocol
+from miniz.type_system import Any, Boolean, Null, Nullable, String, Unit, Void, I64, F64
+
+
+_PYTHON_TYPES: dict[object, TypeProtocol] = {
+    bool: Boolean,
+    int: I64,
+    float: F64,
+    str: String,
+    None: Void,
+    type(None): Void,
+    inspect.Parameter.empty: Any,
+}
+
+
+def _to_bool(value: ObjectProtocol) -> bool:
+    return value is Boolean.TrueInstance
+
+
+def _to_str(value: ObjectProtocol) -> str:
+    return value.native
+
+
+def _to_none(_: ObjectProtocol) -> None:
+    return None
+
+
+def _from_bool(value: bool) -> ObjectProtocol:
+    return Boolean.TrueInstance if value else Boolean.FalseInstance
+
+
+def _from_none(_) -> ObjectProtocol:
+    return Unit.UnitInstance
+
+
+def get_unboxer(type: TypeProtocol) -> Callable[[ObjectProtocol], object] | None:
+    """
+    :return: A function which converts a Z# value of the given type to a Python value, or `None` if the value
+    should be passed as is.
+    """
+    if type is Boolean:
+        return _to_bool
+    if type is String:
+        return _to_str
+    if type is Unit:
+        return _to_none
+    if isinstance(type, Nullable):
+        inner = get_unboxer(type.type)
+        if inner is None:
+            return lambda value: None if value is Null.NullInstance else value
+        return lambda value: None if value is Null.NullInstance else inner(value)
+    return None
+
+
+def get_boxer(type: TypeProtocol) -> Callable[[object], ObjectProtocol] | None:
+    """
+    :return: A function which converts a Python value to a Z# value of the given type, or `None` if the value
+    should be used as is.
+    """
+    if type is Boolean:
+        return _from_bool
+    if type is String:
+        return String.create_from
+    if type is Unit:
+        return _from_none
+    if isinstance(type, Nullable):
+        inner = get_boxer(type.type)
+        if inner is None:
+            return lambda value: Null.NullInstance if value is None else value
+        return lambda value: Null.NullInstance if value is None else inner(value)
+    return None
+
+
+def infer_signature(function: Callable, name: str = None) -> FunctionSignature:
+    """
+    Creates a signature for the given Python callable from its annotations. Unknown or missing annotations
+    are typed as `any`.
+
+    :raises ValueError: if the callable doesn't have an inspectable signature.
+    """
+    py_signature = inspect.signature(function)
+
+    def get_type(annotation):
+        try:
+            return _PYTHON_TYPES.get(annotation, Any)
+        except TypeError:
+            return Any
+
+    result = FunctionSignature(name or function.__name__, get_type(py_signature.return_annotation))
+
+    for py_parameter in py_signature.parameters.values():
+        parameter_type = get_type(py_parameter.annotation)
+        default_value = None
+        if py_parameter.default is not inspect.Parameter.empty:
+            boxer = get_boxer(parameter_type)
+            default_value = boxer(py_parameter.default) if boxer is not None else py_parameter.default
+
+        parameter = Parameter(py_parameter.name, parameter_type, default_value)
+
+        match py_parameter.kind:
+            case inspect.Parameter.POSITIONAL_ONLY | inspect.Parameter.POSITIONAL_OR_KEYWORD:
+                result.positional_parameters.append(parameter)
+            case inspect.Parameter.KEYWORD_ONLY:
+                result.named_parameters.append(parameter)
+            case inspect.Parameter.VAR_POSITIONAL:
+                result.variadic_positional_parameter = parameter
+            case inspect.Parameter.VAR_KEYWORD:
+                result.variadic_named_parameter = parameter
+
+    return result
+
+
+class NativeFunction:
+    """
+    Represents a Python callable bound to a Z# signature.
+
+    Calling this object calls the Python callable directly. The interpreter uses `thunk` instead, which operates
+    on the operand stack.
+    """
+
+    function: Callable
+    signature: FunctionSignature
+    pure: bool
+    thunk: Callable[[list], None]
+
+    def __init__(self, function: Callable, signature: FunctionSignature, *, pure: bool = False):
+        self.function = function
+        self.signature = signature
+        self.pure = pure
+        self.thunk = self._compile_thunk()
+
+    @property
+    def name(self):
+        return self.signature.name
+
+    def _compile_thunk(self) -> Callable[[list], None]:
+        namespace = {"fn": self.function}
+        lines = []
+        positional_args, variadic_positional_args, keyword_args, mapped_args, variadic_named_args = [], [], [], [], []
+
+        for index, parameter in enumerate(self.signature.parameters):
+            unboxer = get_unboxer(parameter.parameter_type)
+            if unboxer is None:
+                lines.append(f"a{index} = pop()")
+            else:
+                namespace[f"u{index}"] = unboxer
+                lines.append(f"a{index} = u{index}(pop())")
+
+            if parameter is self.signature.variadic_positional_parameter:
+                variadic_positional_args.append(f"*a{index}")
+            elif parameter is self.signature.variadic_named_parameter:
+                variadic_named_args.append(f"**a{index}")
+            elif parameter in self.signature.named_parameters:
+                if parameter.name.isidentifier() and not keyword.iskeyword(parameter.name):
+                    keyword_args.append(f"{parameter.name}=a{index}")
+                else:
+                    # the name can't be spelled as a keyword argument, so it is passed through a mapping instead
+                    mapped_args.append(f"{parameter.name!r}: a{index}")
+            else:
+                positional_args.append(f"a{index}")
+
+        lines.reverse()  # arguments are popped from the last one
+
+        # iterable unpacking may not follow keyword unpacking, so the arguments are emitted grouped by kind
+        call_args = [*positional_args, *variadic_positional_args, *keyword_args]
+        if mapped_args:
+            call_args.append(f"**{{{', '.join(mapped_args)}}}")
+        call_args.extend(variadic_named_args)
+
+        call = f"fn({', '.join(call_args)})"
+        return_type = self.signature.return_type
+        if return_type is Void:
+            lines.append(call)
+        elif (boxer := get_boxer(return_type)) is None:
+            lines.append(f"push({call})")
+        else:
+            namespace["box"] = boxer
+            lines.append(f"push(box({call}))")
+
+        source = "def thunk(stack):\n    pop = stack.pop\n    push = stack.append\n" + "".join(f"    {line}\n" for line in lines)
+        exec(source, namespace)
+
+        return namespace["thunk"]
+
+    def __call__(self, *args, **kwargs):
+        return self.function(*args, **kwargs)
+
+    def __repr__(self):
+        return f"native {self.signature!r}"
+
+
+class NativeRegistry:
+    """
+    Maps Python callables to their native function objects.
+    """
+
+    _natives: dict[Callable, NativeFunction]
+
+    def __init__(self):
+        self._natives = {}
+
+    def register(self, function: Callable, signature: FunctionSignature = None, *, name: str = None, pure: bool = False) -> NativeFunction:
+        """
+        Binds the given callable to a signature. If no signature is given, it is inferred from the annotations of the callable.
+
+        :param pure: Whether the callable has no side effects. Calls to pure functions may be memoized.
+        """
+        if isinstance(function, NativeFunction):
+            native = function
+        else:
+            native = NativeFunction(function, signature or infer_signature(function, name), pure=pure)
+        self._natives[native.function] = native
+        return native
+
+    def native(self, signature: FunctionSignature = None, *, name: str = None, pure: bool = False):
+        """
+        Decorator version of `register`. The decorated callable is returned as is.
+        """
+
+        def decorator(function: Callable):
+            self.register(function, signature, name=name, pure=pure)
+            return function
+
+        return decorator
+
+    def register_module(
+            self,
+            module: ModuleType,
+            signatures: dict[str, FunctionSignature] = None,
+            *,
+            pure: bool | Iterable[str] = False
+    ) -> list[NativeFunction]:
+        """
+        Registers all public functions of a Python module (respecting `__all__` if it is defined).
+
+        Functions whose signature can't be inspected and which don't appear in `signatures` are skipped.
+
+        :param signatures: Explicit signatures for functions in the module, by name.
+        :param pure: Either whether all functions are pure, or the names of the pure functions.
+        """
+        signatures = signatures or {}
+        pure_names = None if isinstance(pure, bool) else set(pure)
+
+        names = getattr(module, "__all__", None) or [name for name in vars(module) if not name.startswith('_')]
+
+        result = []
+        for name in names:
+            function = getattr(module, name)
+            if not (inspect.isfunction(function) or inspect.isbuiltin(function)):
+                continue
+            signature = signatures.get(name)
+            if signature is None:
+                try:
+                    signature = infer_signature(function, name)
+                except (ValueError, TypeError):
+                    continue
+            is_pure = pure if pure_names is None else name in pure_names
+            result.append(self.register(function, signature, pure=is_pure))
+
+        return result
+
+    def get(self, function: Callable) -> NativeFunction:
+        """
+        :raises KeyError: if the given callable is not registered.
+        """
+        if isinstance(function, NativeFunction):
+            return function
+        try:
+            return self._natives[function]
+        except KeyError:
+            raise KeyError(f"Native function \'{function}\' is not registered") from None
+
+    def find(self, function: Callable) -> NativeFunction | None:
+        if isinstance(function, NativeFunction):
+            return function
+        return self._natives.get(function)
+
+    def __contains__(self, function: Callable):
+        return self.find(function) is not None
+
+
+if __name__ == '__main__':
+    def element(tag, *children, **attributes):
+        return f"<{tag}{''.join(f' {key}={value}' for key, value in attributes.items())}>{''.join(children)}</{tag}>"
+
+    signature = FunctionSignature("element", String)
+    signature.positional_parameters.append(Parameter("tag", String))
+    signature.named_parameters.append(Parameter("class", String))
+    signature.named_parameters.append(Parameter("id", String))
+    signature.variadic_positional_parameter = Parameter("children", Any)
+
+    registry = NativeRegistry()
+    native = registry.register(element, signature)
+
+    stack = [String.create_from("div"), String.create_from("box"), String.create_from("main"), ("a", "b")]
+    native.thunk(stack)
+
+    print(stack.pop().native)
@@ -0,0 +1,132 @@
+"""
+This module contains the implementation of the numeric instructions on unboxed primitive values.
+
+The operation for each (instruction, type) pair is built once, so executing a numeric instruction is a single
+table lookup and call.
+"""
+
+import math
+import operator
+from typing import Callable
+
+from miniz.type_system import PrimitiveType, Boolean, I32, I64, F64
+from miniz.vm.instructions import Add, Subtract, Multiply, Divide, Remainder, Negate, Equal, NotEqual, LessThan, LessThanOrEqual, GreaterThan, GreaterThanOrEqual
+
+
+def _wrapper(bits: int) -> Callable[[int], int]:
+    half = 1 << bits - 1
+    mask = (1 << bits) - 1
+
+    def wrap(value: int) -> int:
+        return ((value + half) & mask) - half
+
+    return wrap
+
+
+_WRAPPERS = {
+    bits: _wrapper(bits) for bits in (32, 64)
+}
+
+
+def _int_divide(left: int, right: int) -> int:
+    result = abs(left) // abs(right)
+    return result if (left < 0) == (right < 0) else -result
+
+
+def _int_remainder(left: int, right: int) -> int:
+    return left - right * _int_divide(left, right)
+
+
+def _float_divide(left: float, right: float) -> float:
+    if right:
+        return left / right
+    if not left or math.isnan(left):
+        return math.nan
+    return math.copysign(math.inf, left) * math.copysign(1.0, right)
+
+
+def _float_remainder(left: float, right: float) -> float:
+    if not right or math.isinf(left):
+        return math.nan
+    return math.fmod(left, right)
+
+
+def _comparison(op: Callable[[object, object], bool]):
+    true, false = Boolean.TrueInstance, Boolean.FalseInstance
+
+    def compare(left, right):
+        return true if op(left, right) else false
+
+    return compare
+
+
+_INTEGER_OPERATIONS = {
+    Add: operator.add,
+    Subtract: operator.sub,
+    Multiply: operator.mul,
+    Divide: _int_divide,
+    Remainder: _int_remainder,
+    Negate: operator.neg,
+}
+
+_FLOAT_OPERATIONS = {
+    Add: operator.add,
+    Subtract: operator.sub,
+    Multiply: operator.mul,
+    Divide: _float_divide,
+    Remainder: _float_remainder,
+    Negate: operator.neg,
+}
+
+_COMPARISONS = {
+    Equal: operator.eq,
+    NotEqual: operator.ne,
+    LessThan: operator.lt,
+    LessThanOrEqual: operator.le,
+    GreaterThan: operator.gt,
+    GreaterThanOrEqual: operator.ge,
+}
+
+
+def _build_operations(type: PrimitiveType) -> dict[type, Callable]:
+    result = {}
+
+    if type.is_integer:
+        wrap = _WRAPPERS[type.bits]
+        for instruction, op in _INTEGER_OPERATIONS.items():
+            if instruction is Negate:
+                result[instruction] = lambda value, _op=op: wrap(_op(value))
+            else:
+                result[instruction] = lambda left, right, _op=op: wrap(_op(left, right))
+    else:
+        result.update(_FLOAT_OPERATIONS)
+
+    for instruction, op in _COMPARISONS.items():
+        result[instruction] = _comparison(op)
+
+    return result
+
+
+OPERATIONS: dict[PrimitiveType, dict[type, Callable]] = {
+    primitive: _build_operations(primitive) for primitive in (I32, I64, F64)
+}
+"""
+Maps a primitive type and a numeric instruction type to the function which implements it.
+"""
+
+
+def convert(value: int | float, source: PrimitiveType, target: PrimitiveType) -> int | float:
+    """
+    Floats which have no integer value convert to integers as follows: NaN converts to 0, and infinities convert to
+    the smallest or largest value of the target type.
+    """
+    if not target.is_integer:
+        return float(value)
+    if not source.is_integer:
+        if math.isnan(value):
+            return 0
+        if math.isinf(value):
+            half = 1 << target.bits - 1
+            return half - 1 if value > 0 else -half
+        value = int(value)
+    return _WRAPPERS[target.bits](value)
@@ -0,0 +1,364 @@
+"""
+This module contains the effect analysis used by the interpreter to decide which calls may be memoized.
+
+A function is pure if calling it has no effect other than producing its return value. That is, it doesn't modify
+objects it didn't create itself, it only calls whitelisted native functions and all of its callees are pure.
+"""
+
+from dataclasses import dataclass
+from functools import singledispatchmethod
+from typing import Callable, Iterable
+
+from miniz.concrete.oop import Access
+from miniz.interfaces.function import IFunction
+from miniz.interfaces.oop import Binding
+from miniz.type_system import Void
+from miniz.vm.instructions import Instruction, Call, CallNative, CreateInstance, DuplicateTop, Jump, JumpIfFalse, JumpIfTrue, LoadArgument, LoadConstant, LoadField, LoadLocal, LoadObject, \
+    NoOperation, Pop, Return, SetArgument, SetField, SetLocal, TypeOf, IJumpInstruction, Add, Subtract, Multiply, Divide, Remainder, Negate, Equal, NotEqual, LessThan, LessThanOrEqual, \
+    GreaterThan, GreaterThanOrEqual, Convert, ArrayCopy, ArrayFill, ArrayLength, ArraySlice, CreateArray, LoadElement, SetElement
+from miniz.vm.native import NativeRegistry
+from miniz.vm.rtlib import EndOfProgram
+
+
+@dataclass(slots=True)
+class FunctionEffects:
+    pure: bool
+    """
+    Whether the function (including all of its callees) is pure.
+    """
+
+    reads_fields: bool
+    """
+    Whether the function (or any of its callees) reads object fields or array elements. The result of such a function may depend
+    on mutable state, of its arguments or of any other object it reaches, and not only on the identity of its arguments.
+    """
+
+
+@dataclass(slots=True)
+class _BodyEffects:
+    pure: bool
+    reads_fields: bool
+    callees: set[tuple[IFunction, bool]]
+
+
+class _State:
+    """
+    The abstract state before an instruction. Each stack item and target is tracked only by whether it
+    holds an object that was created by the analyzed function.
+    """
+
+    __slots__ = ("stack", "fresh")
+
+    stack: list[bool]
+    fresh: frozenset
+
+    def __init__(self, stack: list[bool], fresh: frozenset):
+        self.stack = stack
+        self.fresh = fresh
+
+    def copy(self):
+        return _State(self.stack.copy(), self.fresh)
+
+    def push(self, fresh: bool = False):
+        self.stack.append(fresh)
+
+    def pop(self) -> bool:
+        return self.stack.pop() if self.stack else False
+
+    def pop_many(self, count: int):
+        for _ in range(count):
+            self.pop()
+
+    def merge(self, other: "_State") -> bool:
+        if len(self.stack) != len(other.stack):
+            stack = []
+        else:
+            stack = [a and b for a, b in zip(self.stack, other.stack)]
+        fresh = self.fresh & other.fresh
+
+        changed = stack != self.stack or fresh != self.fresh
+        self.stack, self.fresh = stack, fresh
+        return changed
+
+
+class PurityAnalyzer:
+    """
+    Computes the effects of functions. Results are cached, so `invalidate` must be called if a function's
+    body is modified after it was analyzed.
+    """
+
+    pure_natives: set[Callable]
+    natives: NativeRegistry | None
+
+    _effects: dict[tuple[IFunction, bool], FunctionEffects]
+    _bodies: dict[tuple[IFunction, bool], _BodyEffects]
+
+    def __init__(self, pure_natives: Iterable[Callable] = (), natives: NativeRegistry | None = None):
+        """
+        :param pure_natives: Native callables which are considered pure in addition to those registered as pure in `natives`.
+        :param natives: The registry used to resolve the callees of `call-native` instructions.
+        """
+        self.pure_natives = set(pure_natives)
+        self.natives = natives
+
+        self._effects = {}
+        self._bodies = {}
+
+    def effects(self, function: IFunction, *, fresh_this: bool = False) -> FunctionEffects:
+        """
+        :param function: The function to analyze.
+        :param fresh_this: Whether the first parameter of the function refers to a newly created object (as in constructors).
+        """
+        key = function, fresh_this
+        try:
+            return self._effects[key]
+        except KeyError:
+            pass
+
+        pure = True
+        reads_fields = False
+
+        visited = set()
+        pending = [key]
+        while pending:
+            item = pending.pop()
+            if item in visited:
+                continue
+            visited.add(item)
+
+            effects = self._effects.get(item) or self._body_effects(*item)
+            reads_fields |= effects.reads_fields
+            if not effects.pure:
+                pure = False
+                break
+            if isinstance(effects, _BodyEffects):
+                pending.extend(effects.callees)
+
+        result = self._effects[key] = FunctionEffects(pure, reads_fields)
+        return result
+
+    def is_pure(self, function: IFunction) -> bool:
+        return self.effects(function).pure
+
+    def invalidate(self):
+        self._effects.clear()
+        self._bodies.clear()
+
+    def _body_effects(self, function: IFunction, fresh_this: bool) -> _BodyEffects:
+        key = function, fresh_this
+        try:
+            return self._bodies[key]
+        except KeyError:
+            pass
+
+        result = self._bodies[key] = self._analyze_body(function, fresh_this)
+        return result
+
+    def _analyze_body(self, function: IFunction, fresh_this: bool) -> _BodyEffects:
+        result = _BodyEffects(True, False, set())
+
+        instructions = function.body.instructions if function.body is not None else None
+        if not instructions:
+            result.pure = False  # a declaration only, we know nothing about what it does
+            return result
+
+        fresh = frozenset()
+        if fresh_this and function.signature.positional_parameters:
+            fresh = frozenset([function.signature.positional_parameters[0]])
+
+        states = {0: _State([], fresh)}
+        pending = [0]
+        while pending:
+            index = pending.pop()
+            inst = instructions[index]
+            state = states[index].copy()
+
+            if not self._effect(inst, state, result):
+                result.pure = False
+                return result
+
+            for successor in self._successors(inst, index):
+                if successor >= len(instructions):
+                    continue
+                if successor not in states:
+                    states[successor] = state.copy()
+                elif not states[successor].merge(state):
+                    continue
+                pending.append(successor)
+
+        return result
+
+    @staticmethod
+    def _successors(inst: Instruction, index: int) -> list[int]:
+        if isinstance(inst, (Return, EndOfProgram)):
+            return []
+        if isinstance(inst, Jump):
+            return [inst.target.index]
+        if isinstance(inst, IJumpInstruction):
+            return [index + 1, inst.target.index]
+        return [index + 1]
+
+    @singledispatchmethod
+    def _effect(self, inst: Instruction, state: _State, result: _BodyEffects) -> bool:
+        return False
+
+    _register = _effect.register
+
+    @_register(Add)
+    @_register(Subtract)
+    @_register(Multiply)
+    @_register(Divide)
+    @_register(Remainder)
+    @_register(Equal)
+    @_register(NotEqual)
+    @_register(LessThan)
+    @_register(LessThanOrEqual)
+    @_register(GreaterThan)
+    @_register(GreaterThanOrEqual)
+    def _(self, _: Instruction, state: _State, result: _BodyEffects):
+        state.pop_many(2)
+        state.push()
+        return True
+
+    @_register
+    def _(self, _: ArrayCopy, state: _State, result: _BodyEffects):
+        result.reads_fields = True
+        state.pop_many(2)
+        destination = state.pop()
+        state.pop_many(2)
+        return destination
+
+    @_register
+    def _(self, _: ArrayFill, state: _State, result: _BodyEffects):
+        state.pop_many(3)
+        return state.pop()
+
+    @_register
+    def _(self, _: ArraySlice, state: _State, result: _BodyEffects):
+        result.reads_fields = True
+        state.pop_many(3)
+        state.push(True)
+        return True
+
+    @_register
+    def _(self, inst: Call, state: _State, result: _BodyEffects):
+        if inst.callee is None:
+            return False
+        result.callees.add((inst.callee, False))
+        state.pop_many(len(inst.callee.signature.parameters))
+        if inst.callee.signature.return_type != Void:
+            state.push()
+        return True
+
+    @_register
+    def _(self, inst: CallNative, state: _State, result: _BodyEffects):
+        native = self.natives.find(inst.callee) if self.natives is not None else None
+        if inst.callee not in self.pure_natives and not (native is not None and native.pure):
+            return False
+        signature = native.signature if native is not None else getattr(inst.callee, "signature", None)
+        if signature is None:
+            state.stack.clear()
+        else:
+            state.pop_many(len(signature.parameters))
+            if signature.return_type != Void:
+                state.push()
+        return True
+
+    @_register
+    def _(self, _: CreateArray, state: _State, result: _BodyEffects):
+        state.pop()
+        state.push(True)
+        return True
+
+    @_register
+    def _(self, inst: CreateInstance, state: _State, result: _BodyEffects):
+        result.callees.add((inst.constructor, True))
+        state.pop_many(len(inst.constructor.signature.parameters))
+        state.push(True)
+        return True
+
+    @_register
+    def _(self, _: DuplicateTop, state: _State, result: _BodyEffects):
+        state.push(state.stack[-1] if state.stack else False)
+        return True
+
+    @_register(Jump)
+    @_register(NoOperation)
+    @_register(Return)
+    @_register(EndOfProgram)
+    def _(self, _: Instruction, state: _State, result: _BodyEffects):
+        return True
+
+    @_register(JumpIfFalse)
+    @_register(JumpIfTrue)
+    @_register(Pop)
+    def _(self, _: Instruction, state: _State, result: _BodyEffects):
+        state.pop()
+        return True
+
+    @_register
+    def _(self, inst: LoadArgument, state: _State, result: _BodyEffects):
+        state.push(inst.parameter in state.fresh)
+        return True
+
+    @_register
+    def _(self, _: LoadElement, state: _State, result: _BodyEffects):
+        result.reads_fields = True
+        state.pop_many(2)
+        state.push()
+        return True
+
+    @_register
+    def _(self, inst: LoadField, state: _State, result: _BodyEffects):
+        result.reads_fields = True
+        if inst.field.binding != Binding.Static:
+            state.pop()
+        state.push()
+        # static and class fields are global state, the result of the function may change even for the same arguments
+        return inst.field.binding == Binding.Instance or getattr(inst.field, "access", None) == Access.Constant
+
+    @_register
+    def _(self, inst: LoadLocal, state: _State, result: _BodyEffects):
+        state.push(inst.local in state.fresh)
+        return True
+
+    @_register
+    def _(self, _: LoadConstant, state: _State, result: _BodyEffects):
+        state.push()
+        return True
+
+    @_register
+    def _(self, _: LoadObject, state: _State, result: _BodyEffects):
+        state.push()
+        return True
+
+    @_register
+    def _(self, inst: SetArgument, state: _State, result: _BodyEffects):
+        state.fresh = state.fresh | {inst.parameter} if state.pop() else state.fresh - {inst.parameter}
+        return True
+
+    @_register
+    def _(self, _: SetElement, state: _State, result: _BodyEffects):
+        state.pop_many(2)
+        return state.pop()
+
+    @_register
+    def _(self, inst: SetField, state: _State, result: _BodyEffects):
+        if inst.field.binding != Binding.Instance:
+            return False
+        state.pop()
+        return state.pop()
+
+    @_register
+    def _(self, inst: SetLocal, state: _State, result: _BodyEffects):
+        state.fresh = state.fresh | {inst.local} if state.pop() else state.fresh - {inst.local}
+        return True
+
+    @_register(ArrayLength)
+    @_register(Convert)
+    @_register(Negate)
+    @_register(TypeOf)
+    def _(self, _: Instruction, state: _State, result: _BodyEffects):
+        state.pop()
+        state.push()
+        return True
@@ -1,10 +1,13 @@
+import array
+import copy
+import weakref
 from typing import Type, TypeVar
 
 from miniz.concrete.function import Function, Local
-from miniz.concrete.oop import Class, Binding
+from miniz.concrete.oop import Class
 from miniz.concrete.signature import Parameter
 from miniz.interfaces.execution import IExecutable, ITarget
-from miniz.type_system import ObjectProtocol
+from miniz.type_system import ObjectProtocol, Array
 from miniz.vm.instruction import Instruction
 from utils import SingletonMeta, NotifyingList
 
@@ -26,18 +29,67 @@ class InvalidInstructionError(Exception):
     ...
 
 
-class Instance(ObjectProtocol):
-    _data: list[ObjectProtocol | None]
+class HeapObject(ObjectProtocol):
+    """
+    Base class for runtime objects with mutable state. The state is stored in `data`, which is accessed through
+    the execution context so modifications are tracked (see `ExecutionContext.fork`). `data` is always the state
+    as seen by the original context, that is, the one which isn't a fork.
+    """
 
-    def __init__(self, runtime_type: Class):
-        self.runtime_type = runtime_type
-        self._data = [None for field in runtime_type.fields if field.binding == Binding.Instance]
+    _data: list | array.array
 
     @property
     def data(self):
         return self._data
 
 
+class Instance(HeapObject):
+    _data: list[ObjectProtocol | None]
+
+    def __init__(self, runtime_type: Class):
+        self.runtime_type = runtime_type
+        self._data = runtime_type.layout.defaults.copy()
+
+
+class ArrayInstance(HeapObject):
+    """
+    An array object. Elements of primitive arrays are stored unboxed in an `array.array`, other elements are
+    stored in a list.
+    """
+
+    runtime_type: Array
+    _data: list | array.array
+
+    def __init__(self, runtime_type: Array, data: list | array.array):
+        self.runtime_type = runtime_type
+        self._data = data
+
+    @classmethod
+    def create(cls, runtime_type: Array, length: int):
+        return cls(runtime_type, cls.repeat(runtime_type, runtime_type.default_element, length))
+
+    @classmethod
+    def create_from(cls, runtime_type: Array, items):
+        if runtime_type.typecode is None:
+            return cls(runtime_type, list(items))
+        return cls(runtime_type, array.array(runtime_type.typecode, items))
+
+    @staticmethod
+    def repeat(runtime_type: Array, value, count: int) -> list | array.array:
+        """
+        :return: A buffer suitable for an array of the given type, which holds `count` copies of `value`.
+        """
+        if runtime_type.typecode is None:
+            return [value] * count
+        return array.array(runtime_type.typecode, (value,)) * count
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return f"[{', '.join(map(repr, self._data))}]"
+
+
 class CodeLocal(ITarget["Code"]):
     ...
 
@@ -92,18 +144,31 @@ class Code(IExecutable):
             target = target.index
         self._ip = target
 
+    def fork(self) -> "Code":
+        """
+        Returns a copy of this object with its own instruction pointer. The instructions and locals are shared.
+        """
+        return copy.copy(self)
+
 
 class Frame(Code):
     _function: Function
     _args: dict[Parameter, ObjectProtocol]
     _locals: dict[Local, ObjectProtocol]
 
+    _args_shared: bool
+    _locals_shared: bool
+
+    memo_key: tuple | None  # set by the interpreter if the result of this call should be memoized
+
     def __init__(self, function: Function, args: dict[Parameter, ObjectProtocol]):
         self._function = function
         self._args = args
         self._locals = {
             local: None for local in function.locals
         }
+        self._args_shared = self._locals_shared = False
+        self.memo_key = None
 
         # if not self._function.body.has_body:
         #     raise ValueError(f"Called an empty (declaration) function")
@@ -117,51 +182,151 @@ class Frame(Code):
     def argument(self, parameter: Parameter, value: ObjectProtocol | None = None) -> ObjectProtocol | None:
         if value is None:
             return self._args[parameter]
+        if self._args_shared:
+            self._args = self._args.copy()
+            self._args_shared = False
         self._args[parameter] = value
 
     def local(self, local: Local, value: ObjectProtocol | None = None) -> ObjectProtocol | None:
         if value is None:
             return self._locals[local]
+        if self._locals_shared:
+            self._locals = self._locals.copy()
+            self._locals_shared = False
         self._locals[local] = value
 
+    def fork(self) -> "Frame":
+        """
+        Returns a copy of this frame. The arguments and locals are shared with this frame until they are modified.
+        """
+        result = super().fork()
+        result._args_shared = result._locals_shared = True
+        return result
+
 
 class ExecutionContext:
     """
     Execution context for a single thread.
+
+    A context may be forked (see `fork`). Forked contexts share their frames, stack and instance data copy-on-write,
+    so a fork only copies the parts it actually modifies. The original context keeps writing to the objects
+    themselves, after handing a copy of the old data to the forks which still share it.
     """
 
     _frame: Code | Frame
     _frames: list[Code]
     _stack: list[ObjectProtocol]
 
+    _frames_shared: bool
+    _owned_frames_start: int  # frames below this index are shared and must be forked before they are modified
+    _stack_shared: bool
+
+    _heap: dict[ObjectProtocol, list] | None  # instance data as seen by this fork. `None` for the original context
+    _heap_owned: set[ObjectProtocol] | None  # objects in `_heap` owned by this context. `None` if `_heap` itself is shared
+    _forks: "weakref.WeakSet[ExecutionContext]"  # the live forks of the original context, shared by all of them
+    _snapshots: set[ObjectProtocol] | None  # objects whose data was copied to all forks of the original context
+
     def __init__(self, code: Code | None):
         self._frames = [code]
         self._frame = code
         self._stack = []
 
+        self._frames_shared = self._stack_shared = False
+        self._owned_frames_start = 0
+
+        self._heap = self._heap_owned = None
+        self._forks = weakref.WeakSet()
+        self._snapshots = set()
+
     @property
     def frame(self):
+        if len(self._frames) <= self._owned_frames_start:
+            self._own_frame()
         return self._frame
 
+    def fork(self) -> "ExecutionContext":
+        """
+        Creates a child context which starts at the current state of this context.
+
+        The child and this context share all of their state. Whichever modifies a frame, the stack or an
+        object's data first, copies only that part.
+        """
+        result = copy.copy(self)
+
+        if self._heap is None:
+            result._heap = {}
+            self._snapshots.clear()
+        result._snapshots = None
+        self._forks.add(result)
+
+        for ctx in (self, result):
+            ctx._frames_shared = ctx._stack_shared = True
+            ctx._owned_frames_start = len(self._frames)
+            ctx._heap_owned = None
+
+        return result
+
+    def push_call(
+            self,
+            function: Function,
+            args: list[ObjectProtocol],
+            kwargs: dict[str, ObjectProtocol] | list[tuple[str, ObjectProtocol]] = ()
+    ):
+        """
+        Pushes a frame for a call with the given positional and keyword arguments. The arguments are bound to the
+        parameters with the binder of the function's signature.
+
+        :raises TypeError: if the signature doesn't accept the given arguments.
+        """
+        self.push_frame(function, function.signature.binder.bind(args, kwargs))
+
     def push_frame(self, function: Function, args: dict[Parameter, ObjectProtocol] | list[ObjectProtocol]):
+        """
+        :param args: Either the value of each parameter, or a list of the values of the parameters in the order of
+        `Signature.parameters`.
+        """
         if isinstance(args, list):
             args = {
                 parameter: arg for parameter, arg in zip(function.signature.parameters, args)
             }
+        if self._frames_shared:
+            self._own_frames()
         self._frame = Frame(function, args)
         self._frames.append(self._frame)
 
     def pop_frame(self):
+        if self._frames_shared:
+            self._own_frames()
         self._frames.pop()
         self._frame = self._frames[-1]
+        self._owned_frames_start = min(self._owned_frames_start, len(self._frames))
 
     def push(self, value: ObjectProtocol):
+        if self._stack_shared:
+            self._own_stack()
         self._stack.append(value)
 
+    @property
+    def stack(self) -> list[ObjectProtocol]:
+        """
+        The operand stack of this context. It may be modified directly.
+        """
+        if self._stack_shared:
+            self._own_stack()
+        return self._stack
+
     def top(self, _: Type[_T] = ObjectProtocol) -> _T:
         return self._stack[-1]
 
+    def peek(self, depth: int, _: Type[_T] = ObjectProtocol) -> _T:
+        """
+        :return: The item `depth` places below the top of the stack, without popping it.
+        """
+        return self._stack[-1 - depth]
+
     def pop(self, *, default: _T = _SENTINEL) -> _T:
+        if self._stack_shared:
+            self._own_stack()
         try:
             return self._stack.pop()
         except IndexError:
@@ -169,5 +334,53 @@ class ExecutionContext:
                 raise
             return default
 
+    def data(self, instance: ObjectProtocol) -> list:
+        """
+        :return: The data of the given object as seen by this context. The result must not be modified.
+        """
+        if self._heap is None:
+            return instance.data
+        try:
+            return self._heap[instance]
+        except KeyError:
+            return instance.data
+
+    def mutable_data(self, instance: ObjectProtocol) -> list:
+        """
+        :return: The data of the given object as seen by this context, copied first if it is shared with another context.
+        """
+        if self._heap is None:
+            if self._forks and instance not in self._snapshots:
+                snapshot = None
+                for ctx in self._forks:
+                    if instance not in ctx._heap:
+                        if snapshot is None:
+                            snapshot = instance.data[:]
+                        ctx._heap[instance] = snapshot
+                self._snapshots.add(instance)
+            return instance.data
+        if self._heap_owned is None:
+            self._heap = self._heap.copy()
+            self._heap_owned = set()
+        if instance not in self._heap_owned:
+            self._heap[instance] = self.data(instance)[:]
+            self._heap_owned.add(instance)
+        return self._heap[instance]
+
     def next_instruction(self) -> Instruction:
-        return self._frame.next_instruction()
+        return self.frame.next_instruction()
+
+    def _own_frame(self):
+        if self._frames_shared:
+            self._own_frames()
+        index = len(self._frames) - 1
+        self._frame = self._frames[index] = self._frame.fork()
+        self._owned_frames_start = index
+
+    def _own_frames(self):
+        self._frames = self._frames.copy()
+        self._frames_shared = False
+
+    def _own_stack(self):
+        self._stack = self._stack.copy()
+        self._stack_shared = False
@@ -1,15 +1,32 @@
+from collections import OrderedDict
 from contextlib import contextmanager
 from functools import singledispatchmethod
 
 from miniz.concrete.function import Function
 from miniz.concrete.oop import Binding
+from miniz.interfaces.oop import dispatch_version
 from miniz.concrete.signature import Parameter
 from miniz.core import ObjectProtocol
-from miniz.type_system import Void
-from miniz.vm.instructions import Instruction, Return, Call, CreateInstance, LoadArgument, LoadObject, SetArgument, SetField, LoadField, LoadLocal, SetLocal, Jump, JumpIfFalse, JumpIfTrue, \
+from miniz.type_system import Void, String, Boolean, type_of
+from miniz.vm.instructions import Instruction, Return, Call, CallInterface, CallNative, CallVirtual, CreateInstance, LoadArgument, LoadConstant, LoadObject, SetArgument, SetField, LoadField, LoadLocal, SetLocal, Jump, JumpIfFalse, JumpIfTrue, \
     DuplicateTop, NoOperation, \
-    TypeOf
-from miniz.vm.rtlib import ExecutionContext, Code, EndOfProgram, Instance
+    TypeOf, Add, Subtract, Multiply, Divide, Remainder, Negate, Equal, NotEqual, LessThan, LessThanOrEqual, GreaterThan, GreaterThanOrEqual, Convert, ArrayCopy, ArrayFill, \
+    ArrayLength, ArraySlice, CreateArray, LoadElement, SetElement, Pop
+from miniz.vm.native import NativeRegistry
+from miniz.vm.numeric import OPERATIONS, convert
+from miniz.vm.purity import PurityAnalyzer
+from miniz.vm.rtlib import ExecutionContext, Code, EndOfProgram, Instance, HeapObject, ArrayInstance
+
+
+_VOID = object()
+
+
+def _memo_value_key(value):
+    if isinstance(value, ObjectProtocol):
+        if getattr(value, "runtime_type", None) is String:
+            return String, value.native
+        return value
+    return type(value), value
 
 
 class Interpreter:
@@ -17,14 +34,30 @@ class Interpreter:
     The VM may only execute concrete instructions.
 
     This VM implementation assumes the input code was checked and validated.
+
+    Calls to pure functions (see `PurityAnalyzer`) are memoized in a bounded LRU cache, keyed by the callee and
+    its arguments. Arguments are compared by identity, except for strings and primitive values which are compared
+    by value. Calls to functions which read object fields or array elements are never memoized.
     """
     _ctx: ExecutionContext | None
     _running: bool
 
-    def __init__(self):
+    _memo: OrderedDict[tuple, ObjectProtocol]
+    _memo_size: int
+
+    natives: NativeRegistry
+    purity: PurityAnalyzer
+
+    def __init__(self, *, memo_size: int = 4096):
         self._ctx = None
         self._running = False
 
+        self._memo = OrderedDict()
+        self._memo_size = memo_size
+
+        self.natives = NativeRegistry()
+        self.purity = PurityAnalyzer(natives=self.natives)
+
     @property
     def ctx(self):
         return self._ctx
@@ -36,18 +69,57 @@ class Interpreter:
             code.instructions.append(EndOfProgram())
         if code.instructions[-1] is not EndOfProgram():
             code.instructions.append(EndOfProgram())
-        ctx = self._ctx = ExecutionContext(code)
+        ctx = ExecutionContext(code)
         if stack is not None:
             for item in stack:
-                self.ctx.push(item)
+                ctx.push(item)
+
+        return self.resume(ctx)
+
+    def resume(self, ctx: ExecutionContext):
+        """
+        Runs the given context until the end of the program is reached.
+
+        This may be used to continue a forked context (see `ExecutionContext.fork`), including from within
+        an instruction executed by this interpreter.
+        """
+        previous = self._ctx, self._running
+
+        self._ctx = ctx
         self._running = True
 
-        while self._running:
-            self.execute(self.ctx.next_instruction())
+        try:
+            while self._running:
+                self.execute(ctx.next_instruction())
+        finally:
+            self._ctx, self._running = previous
 
-        self._ctx = None
         return ctx
 
+    def _call(self, callee: Function):
+        # the caller pushes exactly one value for each parameter (variadic ones already packed), so the arguments are
+        # bound by position in the parameter list. the binder is for calls with positional and keyword arguments,
+        # see `ExecutionContext.push_call`.
+        args = {p: self.ctx.pop() for p in reversed(callee.signature.parameters)}
+
+        key = self._memo_key(callee, args)
+        if key is not None:
+            try:
+                result = self._memo[key]
+            except KeyError:
+                pass
+            else:
+                self._memo.move_to_end(key)
+                if result is not _VOID:
+                    self.ctx.push(result)
+                return
+
+        self.ctx.push_frame(callee, args)
+        self.ctx.frame.memo_key = key
+
+    def clear_memo(self):
+        self._memo.clear()
+
     def execute(self, inst: Instruction):
         # if not isinstance(inst, Instruction):
         #     raise TypeError(f"Expected an instruction, got \'{type(inst)}\'")
@@ -63,14 +135,96 @@ class Interpreter:
 
     @_exec
     def _(self, inst: Call):
-        if inst.callee is None:
-            inst.callee = self.ctx.pop()
-
         # if not isinstance(inst.callee, Function):
         #     raise InvalidInstructionError(f"`call` instruction may only be used with a Z# function, not \'{inst.callee}\'")
 
-        args = {p: self.ctx.pop() for p in reversed(inst.callee.signature.parameters)}
-        self.ctx.push_frame(inst.callee, args)
+        self._call(inst.callee if inst.callee is not None else self.ctx.pop())
+
+    @_exec
+    def _(self, inst: CallInterface):
+        receiver = self.ctx.peek(len(inst.method.signature.parameters) - 1)
+        runtime_type = receiver.runtime_type
+
+        cache = inst.cache
+        if cache is None or cache[0] is not runtime_type or cache[1] != dispatch_version.value:
+            itable = runtime_type.get_itable(inst.method.owner)
+            if itable is None or inst.method not in itable:
+                raise TypeError(f"Type {runtime_type} does not implement {inst.method}")
+            target = itable[inst.method]
+            if target.binding == Binding.Virtual:
+                target = runtime_type.vtable.methods[target.vtable_slot]
+            cache = inst.cache = runtime_type, dispatch_version.value, target
+
+        self._call(cache[2])
+
+    @_exec
+    def _(self, inst: CallVirtual):
+        receiver = self.ctx.peek(len(inst.method.signature.parameters) - 1)
+        self._call(receiver.runtime_type.vtable.methods[inst.method.vtable_slot])
+
+    @_exec(Add)
+    @_exec(Subtract)
+    @_exec(Multiply)
+    @_exec(Divide)
+    @_exec(Remainder)
+    @_exec(Equal)
+    @_exec(NotEqual)
+    @_exec(LessThan)
+    @_exec(LessThanOrEqual)
+    @_exec(GreaterThan)
+    @_exec(GreaterThanOrEqual)
+    def _(self, inst: Instruction):
+        right = self.ctx.pop()
+        self.ctx.push(OPERATIONS[inst.type][type(inst)](self.ctx.pop(), right))
+
+    @_exec
+    def _(self, _: ArrayCopy):
+        count = self.ctx.pop()
+        destination_start = self.ctx.pop()
+        destination = self.ctx.pop()
+        source_start = self.ctx.pop()
+        source = self.ctx.data(self.ctx.pop())
+
+        if source_start < 0 or destination_start < 0 or count < 0 or source_start + count > len(source) or destination_start + count > len(destination):
+            raise IndexError(f"Array copy out of range")
+        self.ctx.mutable_data(destination)[destination_start:destination_start + count] = source[source_start:source_start + count]
+
+    @_exec
+    def _(self, _: ArrayFill):
+        value = self.ctx.pop()
+        count = self.ctx.pop()
+        start = self.ctx.pop()
+        target = self.ctx.pop()
+
+        if start < 0 or count < 0 or start + count > len(target):
+            raise IndexError(f"Array fill out of range")
+        self.ctx.mutable_data(target)[start:start + count] = ArrayInstance.repeat(target.runtime_type, value, count)
+
+    @_exec
+    def _(self, _: ArrayLength):
+        self.ctx.push(len(self.ctx.pop()))
+
+    @_exec
+    def _(self, _: ArraySlice):
+        stop = self.ctx.pop()
+        start = self.ctx.pop()
+        source = self.ctx.pop()
+
+        if start < 0 or stop < start or stop > len(source):
+            raise IndexError(f"Array slice out of range")
+        self.ctx.push(ArrayInstance(source.runtime_type, self.ctx.data(source)[start:stop]))
+
+    @_exec
+    def _(self, inst: CallNative):
+        self.natives.get(inst.callee).thunk(self.ctx.stack)
+
+    @_exec
+    def _(self, inst: Convert):
+        self.ctx.push(convert(self.ctx.pop(), inst.source, inst.target))
+
+    @_exec
+    def _(self, inst: CreateArray):
+        self.ctx.push(ArrayInstance.create(inst.type, self.ctx.pop()))
 
     @_exec
     def _(self, inst: CreateInstance):
@@ -109,16 +263,31 @@ class Interpreter:
     def _(self, inst: LoadArgument):
         self.ctx.push(self.ctx.frame.argument(inst.parameter))
 
+    @_exec
+    def _(self, _: LoadElement):
+        index = self.ctx.pop()
+        array = self.ctx.pop()
+
+        if index < 0 or index >= len(array):
+            raise IndexError(f"Array index out of range")
+        self.ctx.push(self.ctx.data(array)[index])
+
     @_exec
     def _(self, inst: LoadField):
         match inst.field.binding:
             case Binding.Instance:
-                self.ctx.push(self.ctx.pop().data[inst.field.index])
+                self.ctx.push(self.ctx.data(self.ctx.pop())[inst.field.slot])
             case Binding.Class:
-                raise NotImplementedError
+                self.ctx.push(self.ctx.data(self.ctx.pop().class_storage)[inst.field.slot])
             case Binding.Static:
+                self.ctx.push(self.ctx.data(inst.field.owner.static_storage)[inst.field.slot])
+            case _:
                 raise NotImplementedError
 
+    @_exec
+    def _(self, inst: LoadConstant):
+        self.ctx.push(inst.value)
+
     @_exec
     def _(self, inst: LoadLocal):
         self.ctx.push(self.ctx.frame.local(inst.local))
@@ -127,35 +296,63 @@ class Interpreter:
     def _(self, inst: LoadObject):
         self.ctx.push(inst.object)
 
+    @_exec
+    def _(self, inst: Negate):
+        self.ctx.push(OPERATIONS[inst.type][Negate](self.ctx.pop()))
+
     @_exec
     def _(self, _: NoOperation):
         ...
 
+    @_exec
+    def _(self, _: Pop):
+        self.ctx.pop()
+
     @_exec
     def _(self, _: Return):
-        if self.ctx.frame.function.return_type != Void:
+        frame = self.ctx.frame
+        if frame.function.return_type != Void:
             return_value = self.ctx.pop()
 
             self.ctx.pop_frame()
 
             self.ctx.push(return_value)
         else:
+            return_value = _VOID
+
             self.ctx.pop_frame()
 
+        if frame.memo_key is not None and not isinstance(return_value, HeapObject):
+            self._memo[frame.memo_key] = return_value
+            if len(self._memo) > self._memo_size:
+                self._memo.popitem(last=False)
+
     @_exec
     def _(self, inst: SetArgument):
         self.ctx.frame.argument(inst.parameter, self.ctx.pop())
 
+    @_exec
+    def _(self, _: SetElement):
+        value = self.ctx.pop()
+        index = self.ctx.pop()
+        array = self.ctx.pop()
+
+        if index < 0 or index >= len(array):
+            raise IndexError(f"Array index out of range")
+        self.ctx.mutable_data(array)[index] = value
+
     @_exec
     def _(self, inst: SetField):
         value = self.ctx.pop()
 
         match inst.field.binding:
             case Binding.Instance:
-                self.ctx.pop().data[inst.field.index] = value
+                self.ctx.mutable_data(self.ctx.pop())[inst.field.slot] = value
             case Binding.Class:
-                raise NotImplementedError
+                self.ctx.mutable_data(self.ctx.pop().class_storage)[inst.field.slot] = value
             case Binding.Static:
+                self.ctx.mutable_data(inst.field.owner.static_storage)[inst.field.slot] = value
+            case _:
                 raise NotImplementedError
 
     @_exec
@@ -164,12 +361,29 @@ class Interpreter:
 
     @_exec
     def _(self, _: TypeOf):
-        self.ctx.push(self.ctx.pop().runtime_type)
+        self.ctx.push(type_of(self.ctx.pop()))
 
+    def _memo_key(self, function: Function, args: dict[Parameter, ObjectProtocol]) -> tuple | None:
+        if not self._memo_size:
+            return None
 
-if __name__ == '__main__':
-    from miniz.type_system import Boolean
+        # a function which reads fields may observe objects it wasn't given (loaded objects, results of callees), whose
+        # state may change between calls
+        effects = self.purity.effects(function)
+        if not effects.pure or effects.reads_fields:
+            return None
+
+        values = [args[parameter] for parameter in function.signature.parameters]
 
+        key = function, tuple(map(_memo_value_key, values))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+
+if __name__ == '__main__':
     f = Function("f")
 
     f.positional_parameters.append(Parameter("x", Boolean))
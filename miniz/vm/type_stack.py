@@ -2,7 +2,7 @@ from miniz.core import ObjectProtocol, TypeProtocol
 from miniz.interfaces.function import ILocal, IFunctionSignature
 from miniz.interfaces.oop import IField
 from miniz.interfaces.signature import IParameter
-from miniz.type_system import assignable_to, Void
+from miniz.type_system import assignable_to, Void, type_of, PrimitiveType
 
 
 _SENTINEL = object()
@@ -58,11 +58,18 @@ class TypeStack:
     def push_field(self, value: IField):
         self.push_type(value.field_type)
 
+    def push_constant(self, value: int | float, type: PrimitiveType):
+        if not type.is_instance(value):
+            raise TypeError(f"{value!r} is not a valid {type} value")
+        self.push_type(type)
+
     def push_local(self, value: ILocal):
         self.push_type(value.target_type)
 
     def push_object(self, value: ObjectProtocol):
-        self.push_type(value.runtime_type)
+        if isinstance(value, (int, float)):
+            raise TypeError(f"The primitive type of an unboxed value can't be inferred, use push_constant instead")
+        self.push_type(type_of(value))
 
     def push_type(self, value: TypeProtocol):
         self._stack.append(value)
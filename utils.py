@@ -1,3 +1,4 @@
+import weakref
 from enum import Enum
 from typing import TypeVar, Generic, SupportsIndex, Mapping, Callable, Iterable
 
@@ -15,6 +16,53 @@ class SingletonMeta(type):
         return cls._instances[cls]
 
 
+class InternMeta(type):
+    """
+    A metaclass which makes instances created from equal arguments the same object. A class using this metaclass must
+    define `__intern_key__`, a static method which accepts the constructor arguments and returns a hashable key.
+
+    Interned instances are held weakly, so unused instances may still be collected.
+    """
+
+    _interned: weakref.WeakValueDictionary
+
+    def __init__(cls, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        cls._interned = weakref.WeakValueDictionary()
+
+    def __call__(cls, *args, **kwargs):
+        key = cls.__intern_key__(*args, **kwargs)
+        try:
+            return cls._interned[key]
+        except KeyError:
+            pass
+        return cls._interned.setdefault(key, super().__call__(*args, **kwargs))
+
+
+class VersionCounter:
+    """
+    A counter which is incremented whenever the data it tracks changes. Caches may store the value they were
+    computed at and compare it to the current value to tell whether they are still valid.
+    """
+
+    __slots__ = ("value", "_dependents")
+
+    value: int
+
+    def __init__(self, *dependents: "VersionCounter"):
+        """
+        :param dependents: Counters which track data derived from the data tracked by this counter. They are
+        incremented together with this counter.
+        """
+        self.value = 0
+        self._dependents = dependents
+
+    def bump(self):
+        self.value += 1
+        for dependent in self._dependents:
+            dependent.bump()
+
+
 class Event:
     def __init__(self, fn):
         self.fn = fn
@@ -94,6 +142,78 @@ class NotifyingList(list[_T], Generic[_T]):
         return super().__setitem__(key, value)
 
 
+class IndexedList(NotifyingList[_T], Generic[_T]):
+    """
+    A `NotifyingList` which knows the position of each of its items, so `index_of` takes constant time. Positions are
+    assigned when items are appended, and all positions are recomputed on the first lookup after any other change.
+    """
+
+    _positions: dict[int, int] | None
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._positions = None
+
+        def on_append(items: "IndexedList[_T]", item: _T):
+            if items._positions is not None:
+                items._positions.setdefault(id(item), len(items))
+
+        def on_change(items: "IndexedList[_T]", *_):
+            items._positions = None
+
+        self.append += on_append
+        self.extend += on_change
+        self.remove += on_change
+        self.pop += on_change
+        self.__setitem__ += on_change
+        self.__delitem__ += on_change
+
+    def index_of(self, item: _T) -> int:
+        """
+        Like `index`, but items are compared by identity.
+
+        :raises ValueError: if the item is not in the list.
+        """
+        if self._positions is not None:
+            i = self._positions.get(id(item))
+            if i is not None and i < len(self) and list.__getitem__(self, i) is item:
+                return i
+
+        # either the positions are outdated, or an append was rejected by another callback after its position was
+        # assigned, so a miss is only trusted after recomputing the positions
+        positions = self._positions = {}
+        for i, other in enumerate(self):
+            positions.setdefault(id(other), i)
+        try:
+            return positions[id(item)]
+        except KeyError:
+            raise ValueError(f"{item} is not in the list") from None
+
+    def insert(self, __index: SupportsIndex, __object: _T) -> None:
+        self._positions = None
+        return super().insert(__index, __object)
+
+    def clear(self) -> None:
+        self._positions = None
+        return super().clear()
+
+    def sort(self, *args, **kwargs) -> None:
+        self._positions = None
+        return super().sort(*args, **kwargs)
+
+    def reverse(self) -> None:
+        self._positions = None
+        return super().reverse()
+
+    def __iadd__(self, other):
+        self._positions = None
+        return super().__iadd__(other)
+
+    def __imul__(self, other):
+        self._positions = None
+        return super().__imul__(other)
+
+
 class NotifyingDict(dict[_KT, _VT], Generic[_KT, _VT]):
     @event
     def update(self, __m: Mapping[_KT, _VT], **kwargs: _VT) -> None: